@@ -14,10 +14,13 @@ from pathlib import Path
 from datetime import datetime
 
 
+_VERSION_RE = re.compile(r'version = "([^"]+)"')
+
+
 def get_current_version(pyproject_path: Path) -> str:
     """Extract current version from pyproject.toml"""
     content = pyproject_path.read_text()
-    match = re.search(r'version = "([^"]+)"', content)
+    match = _VERSION_RE.search(content)
     if not match:
         raise ValueError("Could not find version in pyproject.toml")
     return match.group(1)
@@ -44,9 +47,20 @@ def bump_version(current_version: str, bump_type: str) -> str:
 
 def update_pyproject(pyproject_path: Path, old_version: str, new_version: str):
     """Update version in pyproject.toml"""
-    content = pyproject_path.read_text()
-    content = content.replace(f'version = "{old_version}"', f'version = "{new_version}"')
-    pyproject_path.write_text(content)
+    with pyproject_path.open('r+', encoding='utf-8', newline='') as f:
+        content = f.read()
+        match = _VERSION_RE.search(content)
+        if not match or match.group(1) != old_version:
+            raise ValueError(f"Could not find version {old_version} in pyproject.toml")
+        start, end = match.span(1)
+        if len(new_version) == len(old_version):
+            # Same length: overwrite the version in place
+            f.seek(len(content[:start].encode('utf-8')))
+            f.write(new_version)
+        else:
+            f.seek(0)
+            f.write(content[:start] + new_version + content[end:])
+            f.truncate()
     print(f"✓ Updated {pyproject_path}")
 
 
@@ -64,8 +78,12 @@ def update_changelog(changelog_path: Path, new_version: str, bump_type: str):
 """
     
     # Insert after [Unreleased] section
-    content = content.replace('## [Unreleased]', f'## [Unreleased]\n{new_entry}')
-    changelog_path.write_text(content)
+    marker = '## [Unreleased]'
+    idx = content.find(marker)
+    if idx < 0:
+        raise ValueError("Could not find [Unreleased] section in CHANGELOG.md")
+    idx += len(marker)
+    changelog_path.write_text(''.join((content[:idx], '\n', new_entry, content[idx:])))
     print(f"✓ Updated {changelog_path}")
 
 
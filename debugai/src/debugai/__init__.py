@@ -15,37 +15,44 @@ __license__ = "MIT"
 
 def _load_env_file():
     """Load environment variables from .env file if it exists."""
-    # Check multiple locations for .env file
-    locations = [
-        Path.cwd() / ".env",
-        Path.cwd() / ".env.example",
-        Path(__file__).parent.parent.parent.parent / ".env",
-        Path(__file__).parent.parent.parent.parent / ".env.example",
-    ]
+    # Nothing to do when explicitly disabled or already configured
+    if os.environ.get("DEBUGAI_NO_DOTENV") or os.environ.get("GEMINI_API_KEY"):
+        return
     
-    for env_path in locations:
-        if env_path.exists():
+    # Check the working directory, then the repository root; one scandir per
+    # directory finds both candidate names
+    names = (".env", ".env.example")
+    directories = (os.getcwd, lambda: str(Path(__file__).parent.parent.parent.parent))
+    
+    for directory in directories:
+        try:
+            with os.scandir(directory()) as entries:
+                found = {entry.name: entry.path for entry in entries if entry.name in names}
+        except OSError:
+            continue
+        
+        for name in names:
+            if name not in found:
+                continue
             try:
-                with open(env_path, "r") as f:
-                    for line in f:
-                        line = line.strip()
-                        # Skip comments and empty lines
-                        if not line or line.startswith("#"):
-                            continue
-                        # Parse KEY=VALUE
-                        if "=" in line:
-                            key, value = line.split("=", 1)
-                            key = key.strip()
-                            value = value.strip()
-                            # Remove quotes if present
-                            if value.startswith('"') and value.endswith('"'):
-                                value = value[1:-1]
-                            elif value.startswith("'") and value.endswith("'"):
-                                value = value[1:-1]
-                            # Only set if not already set
-                            if key and not os.environ.get(key):
-                                os.environ[key] = value
-                break  # Stop after first .env found
+                for line in Path(found[name]).read_text().splitlines():
+                    line = line.strip()
+                    # Skip comments and empty lines
+                    if not line or line.startswith("#"):
+                        continue
+                    # Parse KEY=VALUE
+                    key, sep, value = line.partition("=")
+                    if not sep:
+                        continue
+                    key = key.strip()
+                    value = value.strip()
+                    # Remove quotes if present
+                    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                        value = value[1:-1]
+                    # Only set if not already set
+                    if key and not os.environ.get(key):
+                        os.environ[key] = value
+                return  # Stop after first .env found
             except Exception:
                 pass  # Silently ignore errors
 
@@ -53,8 +60,17 @@ def _load_env_file():
 # Auto-load .env on import
 _load_env_file()
 
-from debugai.core.analyzer import LogAnalyzer
-from debugai.core.engine import DebugEngine
+
+def __getattr__(name):
+    """Lazily import heavy top-level exports on first access (PEP 562)."""
+    if name == "LogAnalyzer":
+        from debugai.core.analyzer import LogAnalyzer
+        return LogAnalyzer
+    if name == "DebugEngine":
+        from debugai.core.engine import DebugEngine
+        return DebugEngine
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "__version__",
@@ -4,27 +4,40 @@ Embeddings - Text embeddings for semantic search
 Uses sentence-transformers for local embeddings or Gemini for cloud embeddings.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
 import numpy as np
 
+# Corpora larger than this are searched with FAISS when it is installed
+FAISS_MIN_CORPUS = 1000
+
 
 class EmbeddingModel:
     """
     Manages text embeddings for semantic similarity search.
     """
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2", use_local: bool = True):
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        use_local: bool = True,
+        batch_size: int = 64
+    ):
         """
         Initialize embedding model.
         
         Args:
             model_name: Model to use for embeddings
             use_local: Use local model (sentence-transformers) vs cloud
+            batch_size: Texts per forward pass in embed_batch
         """
         self.model_name = model_name
         self.use_local = use_local
+        self.batch_size = batch_size
         self._model = None
+        self._loaded = False
         self._dimension = 384  # Default for MiniLM
+        self._matrix: Optional[np.ndarray] = None  # (N, D) corpus, rows L2-normalized
+        self._index = None  # Optional FAISS index over self._matrix
     
     def _load_model(self):
         """Load the embedding model."""
@@ -42,9 +55,10 @@ class EmbeddingModel:
             else:
                 # Use Gemini embeddings
                 self._model = "gemini"
+            self._loaded = True
         return self._model
     
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
         
@@ -52,17 +66,17 @@ class EmbeddingModel:
             text: Text to embed
         
         Returns:
-            Embedding vector as list of floats
+            Embedding vector as a float32 array
         """
         model = self._load_model()
         
         if self.use_local:
             embedding = model.encode(text, convert_to_numpy=True)
-            return embedding.tolist()
+            return embedding.astype(np.float32, copy=False)
         else:
-            return self._embed_with_gemini(text)
+            return np.asarray(self._embed_with_gemini(text), dtype=np.float32)
     
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
         
@@ -70,15 +84,27 @@ class EmbeddingModel:
             texts: List of texts to embed
         
         Returns:
-            List of embedding vectors
+            (len(texts), dimension) float32 array, rows L2-normalized for local models
         """
         model = self._load_model()
         
         if self.use_local:
-            embeddings = model.encode(texts, convert_to_numpy=True)
-            return embeddings.tolist()
+            embeddings = model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
+            )
+            return embeddings.astype(np.float32, copy=False)
         else:
-            return [self._embed_with_gemini(text) for text in texts]
+            return np.asarray(
+                [self._embed_with_gemini(text) for text in texts], dtype=np.float32
+            )
+    
+    def embed_list(self, text: str) -> List[float]:
+        """Generate embedding for a single text as a plain list of floats."""
+        return self.embed(text).tolist()
     
     def _embed_with_gemini(self, text: str) -> List[float]:
         """Generate embedding using Gemini."""
@@ -99,21 +125,37 @@ class EmbeddingModel:
         
         return result["embedding"]
     
-    def similarity(self, embedding1: List[float], embedding2: List[float]) -> float:
+    def similarity(
+        self,
+        embedding1: Union[np.ndarray, List[float]],
+        embedding2: Union[np.ndarray, List[float]],
+        normalized: bool = False
+    ) -> float:
         """
         Calculate cosine similarity between two embeddings.
         
         Args:
             embedding1: First embedding
             embedding2: Second embedding
+            normalized: Both embeddings are already unit length
         
         Returns:
             Similarity score (0-1)
         """
-        vec1 = np.array(embedding1)
-        vec2 = np.array(embedding2)
+        if (
+            isinstance(embedding1, np.ndarray)
+            and isinstance(embedding2, np.ndarray)
+            and embedding1.dtype == embedding2.dtype
+        ):
+            vec1, vec2 = embedding1, embedding2
+        else:
+            vec1 = np.asarray(embedding1, dtype=np.float32)
+            vec2 = np.asarray(embedding2, dtype=np.float32)
         
         dot_product = np.dot(vec1, vec2)
+        if normalized:
+            return float(dot_product)
+        
         norm1 = np.linalg.norm(vec1)
         norm2 = np.linalg.norm(vec2)
         
@@ -124,8 +166,8 @@ class EmbeddingModel:
     
     def find_similar(
         self,
-        query_embedding: List[float],
-        embeddings: List[List[float]],
+        query_embedding: Union[np.ndarray, List[float]],
+        embeddings: Optional[Union[np.ndarray, List[List[float]]]] = None,
         top_k: int = 5
     ) -> List[tuple]:
         """
@@ -133,25 +175,97 @@ class EmbeddingModel:
         
         Args:
             query_embedding: Query embedding
-            embeddings: List of embeddings to search
+            embeddings: Embeddings to search (defaults to the corpus from build_index)
             top_k: Number of results to return
         
         Returns:
             List of (index, similarity_score) tuples
         """
-        similarities = []
+        indices, scores = self.find_similar_arrays(query_embedding, embeddings, top_k)
+        return list(zip(indices.tolist(), scores.tolist()))
+    
+    def find_similar_arrays(
+        self,
+        query_embedding: Union[np.ndarray, List[float]],
+        embeddings: Optional[Union[np.ndarray, List[List[float]]]] = None,
+        top_k: int = 5
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find most similar embeddings to query, without building Python tuples.
+        
+        Args:
+            query_embedding: Query embedding
+            embeddings: Embeddings to search (defaults to the corpus from build_index)
+            top_k: Number of results to return
+        
+        Returns:
+            (indices, scores) arrays, best match first
+        """
+        if embeddings is not None:
+            self.build_index(embeddings)
+        elif self._matrix is None:
+            raise ValueError("No embeddings given and no index built")
+        
+        matrix = self._matrix
+        k = min(max(top_k, 0), len(matrix))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return np.arange(k), np.zeros(k, dtype=np.float32)
+        query = query / query_norm
+        
+        if self._index is not None:
+            scores, indices = self._index.search(query[None, :], k)
+            return indices[0], scores[0]
+        
+        # One GEMV for the whole corpus
+        sims = matrix @ query
+        
+        # Partial sort: only the top_k candidates get fully ordered
+        top_idx = np.argpartition(-sims, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-sims[top_idx], kind="stable")]
+        
+        return top_idx, sims[top_idx]
+    
+    def build_index(self, embeddings: Union[np.ndarray, List[List[float]]]) -> None:
+        """
+        Prepare a corpus for repeated find_similar queries.
         
-        for i, emb in enumerate(embeddings):
-            sim = self.similarity(query_embedding, emb)
-            similarities.append((i, sim))
+        Rows are normalized once; large corpora are also added to a FAISS
+        inner-product index when faiss is installed.
         
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        Args:
+            embeddings: Corpus embeddings, one row per document
+        """
+        matrix = np.array(embeddings, dtype=np.float32)
+        if matrix.size == 0:
+            matrix = matrix.reshape(0, self._dimension)
+        self._matrix = self._normalize_rows(matrix)
+        self._index = None
         
-        return similarities[:top_k]
+        if len(self._matrix) > FAISS_MIN_CORPUS:
+            try:
+                import faiss
+                index = faiss.IndexFlatIP(self._matrix.shape[1])
+                index.add(self._matrix)
+                self._index = index
+            except ImportError:
+                pass  # NumPy matmul path
+    
+    @staticmethod
+    def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+        """L2-normalize each row in place (zero rows stay zero)."""
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        return matrix
     
     @property
     def dimension(self) -> int:
         """Get embedding dimension."""
-        self._load_model()
+        if not self._loaded:
+            self._load_model()
         return self._dimension
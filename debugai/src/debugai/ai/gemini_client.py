@@ -4,9 +4,218 @@ Gemini Client - Google Gemini AI integration
 This module handles all AI-powered analysis using Google's Gemini API.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import asyncio
+import atexit
+import hashlib
+import io
 import os
 import json
+import re
+import time
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+from debugai.ai.prompts import (
+    ERROR_ANALYSIS_PROMPT,
+    ERROR_EXPLANATION_PROMPT,
+    TEXT_EXPLANATION_PROMPT,
+    FIX_SUGGESTION_PROMPT,
+    TEXT_FIX_PROMPT,
+    CORRELATION_PROMPT,
+)
+
+# Explaining at least this many errors at once goes through the Gemini Batch API
+BATCH_MIN_ERRORS = 20
+
+# Seconds between batch job status checks
+BATCH_POLL_INTERVAL = 10.0
+
+# Seconds to wait for a batch job before cancelling it and explaining one by one
+BATCH_TIMEOUT = 120.0
+
+# Model responses kept per client, keyed by a digest of the prompt
+PROMPT_CACHE_SIZE = 128
+
+# Response cache reused across sessions. JSON under the user's home: never
+# pickle, and never the project directory, whose contents come with a checkout
+PROMPT_CACHE_PATH = Path.home() / ".debugai" / "cache" / "responses.json"
+
+# Fenced ```json block in a model response (closing fence optional)
+_JSON_BLOCK_RE = re.compile(r"```json\s*(.*?)(?:```|\Z)", re.DOTALL)
+
+# List item ("- x", "* x", "• x", "1. x", "2) x"); group 1 is the text after the marker
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])[-*•\d.) ]*(.*)")
+
+# google.generativeai, imported on first use (slow to import) and shared by all clients
+_genai = None
+_configured_key: Optional[str] = None
+
+# GenerativeModel per (api_key, model name); sharing them keeps one open channel
+_models: Dict[Tuple[str, str], Any] = {}
+
+# Clients holding responses not yet written to their cache file; strong
+# references keep them alive until save_cache() or the exit hook writes them
+_unsaved_clients: "set[GeminiClient]" = set()
+
+_BATCH_DONE_STATES = {
+    "JOB_STATE_SUCCEEDED",
+    "JOB_STATE_FAILED",
+    "JOB_STATE_CANCELLED",
+    "JOB_STATE_EXPIRED",
+}
+
+
+@atexit.register
+def _save_response_caches() -> None:
+    """Write every client's new responses once, at interpreter exit."""
+    for client in list(_unsaved_clients):
+        client.save_cache()
+
+
+def _load_genai():
+    """Import google.generativeai once and keep the module reference."""
+    global _genai
+    if _genai is None:
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise ImportError(
+                "google-generativeai package not installed. "
+                "Run: pip install google-generativeai"
+            )
+        _genai = genai
+    return _genai
+
+
+class _RateLimiter:
+    """Token buckets capping requests and prompt tokens per minute (0 = unlimited)."""
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        self._requests = min(
+            self.requests_per_minute,
+            self._requests + elapsed * self.requests_per_minute / 60
+        )
+        self._tokens = min(
+            self.tokens_per_minute,
+            self._tokens + elapsed * self.tokens_per_minute / 60
+        )
+    
+    async def acquire(self, lock: asyncio.Lock, tokens: int) -> None:
+        """Wait until one request and `tokens` tokens are available, then take them."""
+        rpm, tpm = self.requests_per_minute, self.tokens_per_minute
+        if rpm <= 0 and tpm <= 0:
+            return
+        requests = 1 if rpm > 0 else 0
+        tokens = min(tokens, tpm) if tpm > 0 else 0
+        async with lock:
+            while True:
+                self._refill()
+                if self._requests >= requests and self._tokens >= tokens:
+                    self._requests -= requests
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep(max(
+                    (requests - self._requests) * 60 / rpm if rpm > 0 else 0,
+                    (tokens - self._tokens) * 60 / tpm if tpm > 0 else 0
+                ))
+
+
+class _SuggestionParser:
+    """
+    Line-by-line suggestion parser that can consume a response as it streams.
+    
+    feed() only processes lines completed by the new chunk; finish() flushes
+    the trailing partial line and returns the suggestions. A ```json block
+    holding a list takes precedence over the parsed bullets.
+    """
+    
+    def __init__(self, max_suggestions: int):
+        self.max_suggestions = max_suggestions
+        self._buf = ""
+        self._chunks: List[str] = []
+        self._has_json = False
+        self._suggestions: List[Dict[str, Any]] = []
+        self._current: Optional[Dict[str, Any]] = None
+        self._code_block: Optional[List[str]] = None
+        self._in_code = False
+    
+    def feed(self, chunk: str) -> None:
+        """Consume the next piece of the response."""
+        self._chunks.append(chunk)
+        self._buf += chunk
+        if "\n" not in self._buf:
+            return
+        *lines, self._buf = self._buf.split("\n")
+        for line in lines:
+            self._line(line)
+    
+    def finish(self) -> List[Dict[str, Any]]:
+        """Flush the last line and return the parsed suggestions."""
+        self._line(self._buf)
+        self._buf = ""
+        
+        if self._has_json:
+            try:
+                match = _JSON_BLOCK_RE.search("".join(self._chunks))
+                if match:
+                    data = _json_loads(match.group(1))
+                    if isinstance(data, list):
+                        return data[:self.max_suggestions]
+            except:
+                pass
+        
+        if self._current:
+            self._suggestions.append(self._current)
+            self._current = None
+        return self._suggestions[:self.max_suggestions]
+    
+    def _line(self, line: str) -> None:
+        if "```json" in line:
+            self._has_json = True
+        
+        if line.startswith("```") and not self._in_code:
+            self._in_code = True
+            self._code_block = []
+            return
+        elif line.startswith("```") and self._in_code:
+            self._in_code = False
+            if self._current and self._code_block:
+                self._current["code"] = "\n".join(self._code_block)
+            self._code_block = None
+            return
+        
+        if self._in_code and self._code_block is not None:
+            self._code_block.append(line)
+            return
+        
+        bullet = _BULLET_RE.match(line)
+        if bullet:
+            if self._current:
+                self._suggestions.append(self._current)
+            self._current = {
+                "title": bullet.group(1).strip(),
+                "description": "",
+                "confidence": 70,
+                "code": None
+            }
+        elif self._current and line.strip():
+            self._current["description"] += line.strip() + " "
 
 
 class GeminiClient:
@@ -15,21 +224,47 @@ class GeminiClient:
     Handles error analysis, explanations, and fix suggestions.
     """
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "gemini-flash-latest"):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-flash-latest",
+        max_concurrent: int = 5,
+        requests_per_minute: int = 60,
+        tokens_per_minute: int = 1_000_000,
+        cache_size: int = PROMPT_CACHE_SIZE,
+        cache_path: Optional[Path] = None
+    ):
         """
         Initialize Gemini client.
         
         Args:
             api_key: Gemini API key (or set GEMINI_API_KEY env var)
             model: Model to use (default: gemini-flash-latest)
+            max_concurrent: Maximum in-flight requests for the async methods
+            requests_per_minute: Request cap for the async methods (0 = unlimited)
+            tokens_per_minute: Prompt token cap for the async methods (0 = unlimited)
+            cache_size: Responses to keep for repeated prompts (0 disables)
+            cache_path: JSON file persisting the response cache (default:
+                ~/.debugai/cache/responses.json)
         """
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
         self.model_name = model
         self._model = None
         self._initialized = False
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.max_concurrent = max_concurrent
+        self._limiter = _RateLimiter(requests_per_minute, tokens_per_minute)
+        self._async_loop = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._limiter_lock: Optional[asyncio.Lock] = None
+        self.cache_size = cache_size
+        self.cache_path = cache_path or PROMPT_CACHE_PATH
+        self._cache: Optional[OrderedDict] = None  # digest -> response text, loaded lazily
     
     def _get_model(self):
         """Initialize and return the Gemini model."""
+        global _configured_key
         if self._model is None:
             if not self.api_key:
                 raise ValueError(
@@ -37,20 +272,116 @@ class GeminiClient:
                     "or run 'debugai config set api-key YOUR_KEY'"
                 )
             
-            try:
-                import google.generativeai as genai
-                
+            genai = _load_genai()
+            
+            # genai.configure is process-wide; only redo it when the key changes
+            if _configured_key != self.api_key:
                 genai.configure(api_key=self.api_key)
-                self._model = genai.GenerativeModel(self.model_name)
-                self._initialized = True
-            except ImportError:
-                raise ImportError(
-                    "google-generativeai package not installed. "
-                    "Run: pip install google-generativeai"
-                )
+                _configured_key = self.api_key
+            
+            # Reuse the model (and its gRPC channel) from earlier clients so
+            # back-to-back calls skip a new TLS handshake
+            key = (self.api_key, self.model_name)
+            if key not in _models:
+                _models[key] = genai.GenerativeModel(self.model_name)
+            self._model = _models[key]
+            self._initialized = True
         
         return self._model
     
+    def _prompt_key(self, prompt: str) -> str:
+        """Digest identifying a (model, prompt) pair in the response cache."""
+        digest = hashlib.blake2b(self.model_name.encode("utf-8"), digest_size=16)
+        digest.update(b"\0")
+        digest.update(prompt.encode("utf-8"))
+        return digest.hexdigest()
+    
+    def _cached(self, key: str) -> Optional[str]:
+        """Cached response text for a prompt digest, or None."""
+        if self.cache_size <= 0:
+            return None
+        if self._cache is None:
+            self._cache = OrderedDict(self._read_cache_file())
+        
+        text = self._cache.get(key)
+        if text is not None:
+            self._cache.move_to_end(key)
+        return text
+    
+    def _remember(self, key: str, text: str) -> None:
+        """Store a response, evicting the least recently used ones."""
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        _unsaved_clients.add(self)
+    
+    def save_cache(self) -> None:
+        """Write new responses to the cache file (done automatically at exit)."""
+        if self not in _unsaved_clients:
+            return
+        _unsaved_clients.discard(self)
+        
+        # Keep entries other processes wrote since this client loaded the file
+        entries = {k: v for k, v in self._read_cache_file().items() if k not in self._cache}
+        entries.update(self._cache)
+        entries = dict(list(entries.items())[-self.cache_size:])
+        
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            pass  # Cache is best-effort
+    
+    def _read_cache_file(self) -> Dict[str, str]:
+        """Entries in the cache file (empty when missing or unreadable)."""
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                entries = _json_loads(f.read())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {k: v for k, v in entries.items() if isinstance(v, str)}
+    
+    def _generate(self, model, prompt: str) -> str:
+        """Send a prompt and return the response text, reusing cached responses."""
+        key = self._prompt_key(prompt)
+        text = self._cached(key)
+        if text is None:
+            text = model.generate_content(prompt).text
+            self._remember(key, text)
+        return text
+    
+    async def _agenerate(self, prompt: str) -> str:
+        """Send a prompt with the async API, within the concurrency and rate limits."""
+        model = self._get_model()
+        
+        key = self._prompt_key(prompt)
+        text = self._cached(key)
+        if text is not None:
+            return text
+        
+        # asyncio primitives belong to one event loop; rebuild them for a new one
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+            self._limiter_lock = asyncio.Lock()
+        
+        async with self._semaphore:
+            await self._limiter.acquire(self._limiter_lock, len(prompt) // 4)
+            response = await model.generate_content_async(prompt)
+        
+        text = response.text
+        self._remember(key, text)
+        return text
+    
     def analyze_errors(
         self,
         errors: List[Dict[str, Any]],
@@ -68,29 +399,30 @@ class GeminiClient:
         Returns:
             Analysis results with root causes and suggestions
         """
-        from debugai.ai.prompts import ERROR_ANALYSIS_PROMPT
-        
         model = self._get_model()
         
-        # Prepare error summary
-        error_text = self._format_errors(errors[:max_errors])
+        prompt = self._analysis_prompt(errors, context, max_errors)
         
-        prompt = ERROR_ANALYSIS_PROMPT.format(
-            errors=error_text,
-            context=context[:4000],  # Limit context size
-            error_count=len(errors)
-        )
+        try:
+            text = self._generate(model, prompt)
+            return self._parse_analysis_response(text)
+        except Exception as e:
+            return self._analysis_failed(e)
+    
+    async def aanalyze_errors(
+        self,
+        errors: List[Dict[str, Any]],
+        context: str,
+        max_errors: int = 10
+    ) -> Dict[str, Any]:
+        """Async analyze_errors."""
+        prompt = self._analysis_prompt(errors, context, max_errors)
         
         try:
-            response = model.generate_content(prompt)
-            return self._parse_analysis_response(response.text)
+            text = await self._agenerate(prompt)
+            return self._parse_analysis_response(text)
         except Exception as e:
-            return {
-                "error": str(e),
-                "root_causes": [],
-                "suggestions": [],
-                "summary": f"Analysis failed: {e}"
-            }
+            return self._analysis_failed(e)
     
     def explain_error(
         self,
@@ -107,27 +439,145 @@ class GeminiClient:
         Returns:
             Explanation dictionary
         """
-        from debugai.ai.prompts import ERROR_EXPLANATION_PROMPT
-        
         model = self._get_model()
         
-        prompt = ERROR_EXPLANATION_PROMPT.format(
-            error_message=error.get("message", error.get("raw", "")),
-            error_level=error.get("level", "error"),
-            service=error.get("service", "unknown"),
-            timestamp=error.get("timestamp", "unknown"),
-            verbose="Include detailed technical analysis." if verbose else ""
+        prompt = self._explanation_prompt(error, verbose)
+        
+        try:
+            text = self._generate(model, prompt)
+            return self._parse_explanation_response(text, verbose)
+        except Exception as e:
+            return self._explanation_failed(e)
+    
+    async def aexplain_error(
+        self,
+        error: Dict[str, Any],
+        verbose: bool = False
+    ) -> Dict[str, Any]:
+        """Async explain_error."""
+        prompt = self._explanation_prompt(error, verbose)
+        
+        try:
+            text = await self._agenerate(prompt)
+            return self._parse_explanation_response(text, verbose)
+        except Exception as e:
+            return self._explanation_failed(e)
+    
+    def batch_explain(
+        self,
+        errors: List[Dict[str, Any]],
+        verbose: bool = False,
+        timeout: float = BATCH_TIMEOUT
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Explain many errors in one Gemini Batch API job.
+        
+        Falls back to one explain_error call per error for small inputs,
+        when the google-genai SDK (which provides batch jobs) isn't installed,
+        or when the job hasn't finished within the timeout.
+        
+        Args:
+            errors: Error entries to explain
+            verbose: Include technical details
+            timeout: Seconds to wait for the batch job
+        
+        Returns:
+            Explanations keyed by error_id (or list position when missing)
+        """
+        keys = [str(error.get("error_id") or i) for i, error in enumerate(errors)]
+        
+        # Answers already in the response cache are not resubmitted
+        results: Dict[str, Dict[str, Any]] = {}
+        pending: Dict[str, Tuple[Dict[str, Any], str, str]] = {}  # key -> (error, prompt, cache key)
+        for key, error in zip(keys, errors):
+            prompt = self._explanation_prompt(error, verbose)
+            cache_key = self._prompt_key(prompt)
+            text = self._cached(cache_key)
+            if text is not None:
+                results[key] = self._parse_explanation_response(text, verbose)
+            else:
+                pending[key] = (error, prompt, cache_key)
+        
+        client = None
+        if len(pending) >= BATCH_MIN_ERRORS:
+            try:
+                from google import genai as genai_batch
+                client = genai_batch.Client(api_key=self.api_key)
+            except ImportError:
+                pass
+        
+        if client is None:
+            results.update(self._explain_each(pending, verbose))
+            return {key: results[key] for key in keys}
+        
+        requests = "\n".join(
+            json.dumps({
+                "key": key,
+                "request": {"contents": [{"parts": [{"text": prompt}]}]}
+            })
+            for key, (_, prompt, _) in pending.items()
         )
         
+        failed = {
+            "summary": "Could not explain error: batch job failed",
+            "technical_details": None,
+            "similar_issues": []
+        }
+        
         try:
-            response = model.generate_content(prompt)
-            return self._parse_explanation_response(response.text, verbose)
+            uploaded = client.files.upload(
+                file=io.BytesIO(requests.encode("utf-8")),
+                config={"display_name": "debugai-explain", "mime_type": "jsonl"}
+            )
+            job = client.batches.create(model=self.model_name, src=uploaded.name)
+            deadline = time.monotonic() + timeout
+            while job.state.name not in _BATCH_DONE_STATES:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(min(BATCH_POLL_INTERVAL, max(0.0, deadline - time.monotonic())))
+                job = client.batches.get(name=job.name)
+            
+            output = ""
+            stalled = job.state.name not in _BATCH_DONE_STATES
+            if stalled:
+                client.batches.cancel(name=job.name)
+            elif job.state.name == "JOB_STATE_SUCCEEDED":
+                output = client.files.download(file=job.dest.file_name).decode("utf-8")
         except Exception as e:
-            return {
-                "summary": f"Could not explain error: {e}",
-                "technical_details": None,
-                "similar_issues": []
-            }
+            failed["summary"] = f"Could not explain error: {e}"
+            stalled, output = False, ""
+        
+        if stalled:
+            # The job missed the deadline (and was cancelled); explain one by one
+            results.update(self._explain_each(pending, verbose))
+            return {key: results[key] for key in keys}
+        
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            try:
+                item = _json_loads(line)
+                key = item.get("key")
+                parts = item["response"]["candidates"][0]["content"]["parts"]
+                text = "".join(part.get("text", "") for part in parts)
+            except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+                continue
+            if key in pending:
+                self._remember(pending[key][2], text)
+                results[key] = self._parse_explanation_response(text, verbose)
+        
+        return {key: results.get(key) or dict(failed) for key in keys}
+    
+    def _explain_each(
+        self,
+        pending: Dict[str, Tuple[Dict[str, Any], str, str]],
+        verbose: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        """Explain errors one request at a time (batch_explain's fallback)."""
+        return {
+            key: self.explain_error(error, verbose=verbose)
+            for key, (error, _, _) in pending.items()
+        }
     
     def explain_text(self, error_text: str) -> str:
         """
@@ -139,15 +589,53 @@ class GeminiClient:
         Returns:
             Plain English explanation
         """
-        from debugai.ai.prompts import TEXT_EXPLANATION_PROMPT
+        model = self._get_model()
         
+        prompt = TEXT_EXPLANATION_PROMPT.substitute(error_text=error_text)
+        
+        try:
+            text = self._generate(model, prompt)
+            return text
+        except Exception as e:
+            return f"Could not explain: {e}"
+    
+    def explain_text_stream(self, error_text: str) -> Iterator[str]:
+        """
+        Explain any error text, yielding the explanation as it is generated.
+        
+        Args:
+            error_text: Error message or stack trace
+        
+        Yields:
+            Chunks of the plain English explanation
+        """
         model = self._get_model()
         
-        prompt = TEXT_EXPLANATION_PROMPT.format(error_text=error_text)
+        prompt = TEXT_EXPLANATION_PROMPT.substitute(error_text=error_text)
+        
+        key = self._prompt_key(prompt)
+        text = self._cached(key)
+        if text is not None:
+            yield text
+            return
         
+        chunks = []
         try:
-            response = model.generate_content(prompt)
-            return response.text
+            for chunk in model.generate_content(prompt, stream=True):
+                chunks.append(chunk.text)
+                yield chunk.text
+        except Exception as e:
+            yield f"Could not explain: {e}"
+            return
+        self._remember(key, "".join(chunks))
+    
+    async def aexplain_text(self, error_text: str) -> str:
+        """Async explain_text."""
+        prompt = TEXT_EXPLANATION_PROMPT.substitute(error_text=error_text)
+        
+        try:
+            text = await self._agenerate(prompt)
+            return text
         except Exception as e:
             return f"Could not explain: {e}"
     
@@ -166,26 +654,29 @@ class GeminiClient:
         Returns:
             List of fix suggestions
         """
-        from debugai.ai.prompts import FIX_SUGGESTION_PROMPT
-        
         model = self._get_model()
         
-        prompt = FIX_SUGGESTION_PROMPT.format(
-            error_message=error.get("message", error.get("raw", "")),
-            service=error.get("service", "unknown"),
-            max_suggestions=max_suggestions
-        )
+        prompt = self._fix_prompt(error, max_suggestions)
         
         try:
-            response = model.generate_content(prompt)
-            return self._parse_suggestions_response(response.text, max_suggestions)
+            text = self._generate(model, prompt)
+            return self._parse_suggestions_response(text, max_suggestions)
         except Exception as e:
-            return [{
-                "title": "Analysis Failed",
-                "description": str(e),
-                "confidence": 0,
-                "code": None
-            }]
+            return self._suggestions_failed(e)
+    
+    async def asuggest_fixes(
+        self,
+        error: Dict[str, Any],
+        max_suggestions: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Async suggest_fixes."""
+        prompt = self._fix_prompt(error, max_suggestions)
+        
+        try:
+            text = await self._agenerate(prompt)
+            return self._parse_suggestions_response(text, max_suggestions)
+        except Exception as e:
+            return self._suggestions_failed(e)
     
     def suggest_for_text(
         self,
@@ -204,25 +695,30 @@ class GeminiClient:
         Returns:
             List of suggestions
         """
-        from debugai.ai.prompts import TEXT_FIX_PROMPT
-        
         model = self._get_model()
         
-        prompt = TEXT_FIX_PROMPT.format(
-            error_text=error_text,
-            language=language,
-            max_suggestions=max_suggestions
-        )
+        prompt = self._text_fix_prompt(error_text, language, max_suggestions)
         
         try:
-            response = model.generate_content(prompt)
-            return self._parse_suggestions_response(response.text, max_suggestions)
+            text = self._generate(model, prompt)
+            return self._parse_suggestions_response(text, max_suggestions)
         except Exception as e:
-            return [{
-                "title": "Analysis Failed",
-                "description": str(e),
-                "confidence": 0
-            }]
+            return self._suggestions_failed(e, with_code=False)
+    
+    async def asuggest_for_text(
+        self,
+        error_text: str,
+        language: str = "python",
+        max_suggestions: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Async suggest_for_text."""
+        prompt = self._text_fix_prompt(error_text, language, max_suggestions)
+        
+        try:
+            text = await self._agenerate(prompt)
+            return self._parse_suggestions_response(text, max_suggestions)
+        except Exception as e:
+            return self._suggestions_failed(e, with_code=False)
     
     def correlate_errors(
         self,
@@ -237,28 +733,112 @@ class GeminiClient:
         Returns:
             Correlation analysis
         """
-        from debugai.ai.prompts import CORRELATION_PROMPT
-        
         model = self._get_model()
         
         error_text = self._format_errors(errors[:20])
-        prompt = CORRELATION_PROMPT.format(errors=error_text)
+        prompt = CORRELATION_PROMPT.substitute(errors=error_text)
         
         try:
-            response = model.generate_content(prompt)
-            return self._parse_correlation_response(response.text)
+            text = self._generate(model, prompt)
+            return self._parse_correlation_response(text)
         except Exception as e:
             return {"error": str(e), "correlations": []}
     
+    async def acorrelate_errors(
+        self,
+        errors: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Async correlate_errors."""
+        error_text = self._format_errors(errors[:20])
+        prompt = CORRELATION_PROMPT.substitute(errors=error_text)
+        
+        try:
+            text = await self._agenerate(prompt)
+            return self._parse_correlation_response(text)
+        except Exception as e:
+            return {"error": str(e), "correlations": []}
+    
+    def _analysis_prompt(
+        self,
+        errors: List[Dict[str, Any]],
+        context: str,
+        max_errors: int
+    ) -> str:
+        """Build the analysis prompt for a set of errors."""
+        return ERROR_ANALYSIS_PROMPT.substitute(
+            errors=self._format_errors(errors[:max_errors]),
+            context=context[:4000],  # Limit context size
+            error_count=len(errors)
+        )
+    
+    def _fix_prompt(self, error: Dict[str, Any], max_suggestions: int) -> str:
+        """Build the fix suggestion prompt for one error."""
+        return FIX_SUGGESTION_PROMPT.substitute(
+            error_message=error.get("message", error.get("raw", "")),
+            service=error.get("service", "unknown"),
+            max_suggestions=max_suggestions
+        )
+    
+    def _text_fix_prompt(self, error_text: str, language: str, max_suggestions: int) -> str:
+        """Build the fix suggestion prompt for raw error text."""
+        return TEXT_FIX_PROMPT.substitute(
+            error_text=error_text,
+            language=language,
+            max_suggestions=max_suggestions
+        )
+    
+    @staticmethod
+    def _analysis_failed(e: Exception) -> Dict[str, Any]:
+        """Analysis result for a failed request."""
+        return {
+            "error": str(e),
+            "root_causes": [],
+            "suggestions": [],
+            "summary": f"Analysis failed: {e}"
+        }
+    
+    @staticmethod
+    def _explanation_failed(e: Exception) -> Dict[str, Any]:
+        """Explanation result for a failed request."""
+        return {
+            "summary": f"Could not explain error: {e}",
+            "technical_details": None,
+            "similar_issues": []
+        }
+    
+    @staticmethod
+    def _suggestions_failed(e: Exception, with_code: bool = True) -> List[Dict[str, Any]]:
+        """Suggestion list for a failed request."""
+        failed = {
+            "title": "Analysis Failed",
+            "description": str(e),
+            "confidence": 0
+        }
+        if with_code:
+            failed["code"] = None
+        return [failed]
+    
+    def _explanation_prompt(self, error: Dict[str, Any], verbose: bool) -> str:
+        """Build the explanation prompt for one error."""
+        return ERROR_EXPLANATION_PROMPT.substitute(
+            error_message=error.get("message", error.get("raw", "")),
+            error_level=error.get("level", "error"),
+            service=error.get("service", "unknown"),
+            timestamp=error.get("timestamp", "unknown"),
+            verbose="Include detailed technical analysis." if verbose else ""
+        )
+    
     def _format_errors(self, errors: List[Dict[str, Any]]) -> str:
         """Format errors for prompt."""
-        lines = []
+        parts = []
         for i, error in enumerate(errors, 1):
-            lines.append(f"{i}. [{error.get('level', 'ERROR')}] {error.get('service', 'unknown')}")
-            lines.append(f"   Time: {error.get('timestamp', 'unknown')}")
-            lines.append(f"   Message: {error.get('message', error.get('raw', ''))[:500]}")
-            lines.append("")
-        return "\n".join(lines)
+            message = (error.get("message") or error.get("raw") or "")[:500]
+            parts.append(
+                f"{i}. [{error.get('level', 'ERROR')}] {error.get('service', 'unknown')}\n"
+                f"   Time: {error.get('timestamp', 'unknown')}\n"
+                f"   Message: {message}\n"
+            )
+        return "\n".join(parts)
     
     def _parse_analysis_response(self, text: str) -> Dict[str, Any]:
         """Parse AI analysis response."""
@@ -270,11 +850,11 @@ class GeminiClient:
         
         # Try to parse as JSON first
         try:
-            if "```json" in text:
-                json_str = text.split("```json")[1].split("```")[0]
-                return json.loads(json_str)
+            match = _JSON_BLOCK_RE.search(text)
+            if match:
+                return _json_loads(match.group(1))
             elif text.strip().startswith("{"):
-                return json.loads(text)
+                return _json_loads(text)
         except:
             pass
         
@@ -294,16 +874,18 @@ class GeminiClient:
                 if current_section == "summary":
                     result["summary"] += line + " "
                 elif current_section == "root_causes":
-                    if line.startswith(("-", "*", "•", "1", "2", "3")):
+                    bullet = _BULLET_RE.match(line)
+                    if bullet:
                         result["root_causes"].append({
-                            "title": line.lstrip("-*•0123456789. "),
+                            "title": bullet.group(1),
                             "explanation": "",
                             "confidence": 70
                         })
                 elif current_section == "suggestions":
-                    if line.startswith(("-", "*", "•", "1", "2", "3")):
+                    bullet = _BULLET_RE.match(line)
+                    if bullet:
                         result["suggestions"].append({
-                            "title": line.lstrip("-*•0123456789. "),
+                            "title": bullet.group(1),
                             "description": "",
                             "code": None
                         })
@@ -334,53 +916,9 @@ class GeminiClient:
         max_suggestions: int
     ) -> List[Dict[str, Any]]:
         """Parse suggestions response."""
-        suggestions = []
-        
-        # Try JSON first
-        try:
-            if "```json" in text:
-                json_str = text.split("```json")[1].split("```")[0]
-                data = json.loads(json_str)
-                if isinstance(data, list):
-                    return data[:max_suggestions]
-        except:
-            pass
-        
-        # Parse text
-        current_suggestion = None
-        code_block = None
-        in_code = False
-        
-        for line in text.split("\n"):
-            if line.startswith("```") and not in_code:
-                in_code = True
-                code_block = []
-                continue
-            elif line.startswith("```") and in_code:
-                in_code = False
-                if current_suggestion and code_block:
-                    current_suggestion["code"] = "\n".join(code_block)
-                code_block = None
-                continue
-            
-            if in_code and code_block is not None:
-                code_block.append(line)
-            elif line.strip().startswith(("1.", "2.", "3.", "-", "*", "•")):
-                if current_suggestion:
-                    suggestions.append(current_suggestion)
-                current_suggestion = {
-                    "title": line.lstrip("-*•0123456789. ").strip(),
-                    "description": "",
-                    "confidence": 70,
-                    "code": None
-                }
-            elif current_suggestion and line.strip():
-                current_suggestion["description"] += line.strip() + " "
-        
-        if current_suggestion:
-            suggestions.append(current_suggestion)
-        
-        return suggestions[:max_suggestions]
+        parser = _SuggestionParser(max_suggestions)
+        parser.feed(text)
+        return parser.finish()
     
     def _parse_correlation_response(self, text: str) -> Dict[str, Any]:
         """Parse correlation response."""
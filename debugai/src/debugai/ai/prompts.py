@@ -2,16 +2,19 @@
 AI Prompts - Prompt templates for Gemini AI
 
 These prompts are carefully engineered for optimal debugging assistance.
+Templates use ``string.Template`` placeholders and are filled with ``substitute``.
 """
 
+from string import Template
+
 # Error Analysis Prompt
-ERROR_ANALYSIS_PROMPT = """You are an expert debugging assistant analyzing application logs.
+ERROR_ANALYSIS_PROMPT = Template("""You are an expert debugging assistant analyzing application logs.
 
-## Errors Found ({error_count} total):
-{errors}
+## Errors Found (${error_count} total):
+${errors}
 
 ## Additional Context:
-{context}
+${context}
 
 ## Your Task:
 Analyze these errors and provide:
@@ -24,39 +27,39 @@ Analyze these errors and provide:
 
 Respond in this JSON format:
 ```json
-{{
+{
   "root_causes": [
-    {{
+    {
       "title": "Brief title",
       "explanation": "Detailed explanation",
       "confidence": 85,
       "affected_services": ["service1", "service2"]
-    }}
+    }
   ],
   "suggestions": [
-    {{
+    {
       "title": "Fix title",
       "description": "What to do",
       "code": "example code if applicable",
       "language": "python",
       "priority": "high"
-    }}
+    }
   ],
   "summary": "Plain English summary of what happened and why"
-}}
+}
 ```
-"""
+""")
 
 # Error Explanation Prompt
-ERROR_EXPLANATION_PROMPT = """You are a helpful debugging assistant. Explain this error in plain English that any developer can understand.
+ERROR_EXPLANATION_PROMPT = Template("""You are a helpful debugging assistant. Explain this error in plain English that any developer can understand.
 
 ## Error Details:
-- **Level**: {error_level}
-- **Service**: {service}
-- **Time**: {timestamp}
-- **Message**: {error_message}
+- **Level**: ${error_level}
+- **Service**: ${service}
+- **Time**: ${timestamp}
+- **Message**: ${error_message}
 
-{verbose}
+${verbose}
 
 ## Instructions:
 1. Explain what this error means in simple terms
@@ -65,13 +68,13 @@ ERROR_EXPLANATION_PROMPT = """You are a helpful debugging assistant. Explain thi
 4. If there's a stack trace, explain the flow
 
 Keep your explanation clear and actionable. Avoid jargon unless necessary, and explain any technical terms you use.
-"""
+""")
 
 # Text Explanation Prompt
-TEXT_EXPLANATION_PROMPT = """You are a helpful debugging assistant. Explain this error or log message in plain English:
+TEXT_EXPLANATION_PROMPT = Template("""You are a helpful debugging assistant. Explain this error or log message in plain English:
 
 ```
-{error_text}
+${error_text}
 ```
 
 Provide:
@@ -80,17 +83,17 @@ Provide:
 3. **What to do**: Quick steps to investigate or fix
 
 Keep it concise and practical.
-"""
+""")
 
 # Fix Suggestion Prompt
-FIX_SUGGESTION_PROMPT = """You are an expert developer helping to fix an error.
+FIX_SUGGESTION_PROMPT = Template("""You are an expert developer helping to fix an error.
 
 ## Error:
-- **Service**: {service}
-- **Message**: {error_message}
+- **Service**: ${service}
+- **Message**: ${error_message}
 
 ## Your Task:
-Provide {max_suggestions} actionable fix suggestions.
+Provide ${max_suggestions} actionable fix suggestions.
 
 For each suggestion, provide:
 1. A clear title
@@ -101,26 +104,26 @@ For each suggestion, provide:
 Respond in JSON format:
 ```json
 [
-  {{
+  {
     "title": "Fix Title",
     "description": "Detailed steps to fix",
     "code": "// code example",
     "language": "python",
     "confidence": 85
-  }}
+  }
 ]
 ```
-"""
+""")
 
 # Text Fix Prompt
-TEXT_FIX_PROMPT = """You are an expert {language} developer helping to fix an error.
+TEXT_FIX_PROMPT = Template("""You are an expert ${language} developer helping to fix an error.
 
 ## Error:
 ```
-{error_text}
+${error_text}
 ```
 
-Provide {max_suggestions} specific, actionable fixes.
+Provide ${max_suggestions} specific, actionable fixes.
 
 For each fix:
 1. Clear title
@@ -131,22 +134,22 @@ For each fix:
 Respond in JSON format:
 ```json
 [
-  {{
+  {
     "title": "Fix Title",
     "description": "What to do",
     "code": "corrected code",
-    "language": "{language}",
+    "language": "${language}",
     "confidence": 80
-  }}
+  }
 ]
 ```
-"""
+""")
 
 # Error Correlation Prompt
-CORRELATION_PROMPT = """You are analyzing multiple errors to find correlations and the root cause.
+CORRELATION_PROMPT = Template("""You are analyzing multiple errors to find correlations and the root cause.
 
 ## Errors:
-{errors}
+${errors}
 
 ## Analyze:
 1. Are these errors related? How?
@@ -155,13 +158,13 @@ CORRELATION_PROMPT = """You are analyzing multiple errors to find correlations a
 4. What service or component is the common factor?
 
 Provide a clear analysis of how these errors are connected and what the underlying issue is.
-"""
+""")
 
 # Timeline Analysis Prompt
-TIMELINE_PROMPT = """Analyze this sequence of events and explain what happened:
+TIMELINE_PROMPT = Template("""Analyze this sequence of events and explain what happened:
 
 ## Event Timeline:
-{events}
+${events}
 
 ## Questions to Answer:
 1. What triggered the initial problem?
@@ -170,13 +173,13 @@ TIMELINE_PROMPT = """Analyze this sequence of events and explain what happened:
 4. At what point could intervention have prevented the failure?
 
 Provide a narrative explanation of the incident timeline.
-"""
+""")
 
 # Pattern Detection Prompt
-PATTERN_PROMPT = """Analyze these log patterns and identify:
+PATTERN_PROMPT = Template("""Analyze these log patterns and identify:
 
 ## Patterns Found:
-{patterns}
+${patterns}
 
 ## Identify:
 1. Which patterns indicate problems?
@@ -185,4 +188,4 @@ PATTERN_PROMPT = """Analyze these log patterns and identify:
 4. Any recommendations for alerting or monitoring?
 
 Provide actionable insights based on these patterns.
-"""
+""")
@@ -0,0 +1,147 @@
+"""
+Template Cache - Reuse AI analyses for recurring error templates
+
+Error messages are reduced to templates by masking their variable parts
+(quoted strings, UUIDs, hex values, numbers). An analysis is cached under
+the full set of templates in the batch it covered, so a later batch with the
+same kinds of errors reuses it, while a batch mixing in other errors is
+analyzed afresh instead of borrowing root causes from unrelated batches.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+import re
+import time
+
+# Default on-disk location, shared by every project
+TEMPLATE_CACHE_PATH = Path.home() / ".debugai" / "cache" / "ai_cache.json"
+
+# Template sets kept; the least frequently reused are dropped first
+TEMPLATE_CACHE_SIZE = 256
+
+# Hours an analysis stays valid (storage.cache_ttl in the config)
+TEMPLATE_CACHE_TTL_HOURS = 24
+
+# Variable parts of a message, longest alternatives first
+_VARIABLE_RE = re.compile(
+    r"\"[^\"]*\"|'[^']*'"  # Quoted strings
+    r"|\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"  # UUIDs
+    r"|\b0[xX][0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{6,}\b"  # Hex
+    r"|\d+(?:\.\d+)*"  # Numbers, versions, IPs
+)
+
+
+def message_template(message: str) -> str:
+    """Mask the variable parts of a message with <*>."""
+    return _VARIABLE_RE.sub("<*>", message)
+
+
+def _digest(text: str) -> str:
+    """Hex digest used as a cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TemplateCache:
+    """
+    Persistent map from sets of error templates to the AI analysis that covered them.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_entries: int = TEMPLATE_CACHE_SIZE,
+        ttl_hours: float = TEMPLATE_CACHE_TTL_HOURS
+    ):
+        """
+        Initialize template cache.
+        
+        Args:
+            path: JSON file holding the cache (default: ~/.debugai/cache/ai_cache.json)
+            max_entries: Maximum template sets to keep
+            ttl_hours: Hours before a cached analysis expires
+        """
+        self.path = path or TEMPLATE_CACHE_PATH
+        self.max_entries = max_entries
+        self.ttl = ttl_hours * 3600
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None  # template set digest -> entry
+        self._dirty = False
+    
+    def key(self, errors: Iterable[Dict[str, Any]]) -> str:
+        """Digest of the distinct message templates in a batch of errors."""
+        templates = {
+            message_template(error.get("message") or error.get("raw") or "")
+            for error in errors
+        }
+        return _digest("\0".join(sorted(templates)))
+    
+    def get(self, errors: Iterable[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Cached analysis for exactly this batch's templates, or None if missing or expired."""
+        entries = self._load()
+        key = self.key(errors)
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["created"] > self.ttl:
+            del entries[key]
+            self._dirty = True
+            return None
+        
+        entry["freq"] += 1
+        self._dirty = True
+        return entry["analysis"]
+    
+    def put(self, errors: Iterable[Dict[str, Any]], analysis: Dict[str, Any]) -> None:
+        """Store the analysis of a batch of errors."""
+        errors = list(errors)
+        entries = self._load()
+        key = self.key(errors)
+        entries[key] = {
+            "analysis": analysis,
+            "reference_msg": (errors[0].get("message") or "")[:200] if errors else "",
+            "freq": 1,
+            "created": time.time(),
+        }
+        
+        # Drop expired entries, then the least reused (oldest first on ties), never this one
+        now = time.time()
+        for stale in [k for k, v in entries.items() if now - v["created"] > self.ttl]:
+            del entries[stale]
+        while len(entries) > self.max_entries:
+            candidates = [k for k in entries if k != key]
+            if not candidates:
+                break
+            del entries[min(candidates, key=lambda k: entries[k]["freq"])]
+        self._dirty = True
+    
+    def save(self) -> None:
+        """Write the cache to disk if it changed, replacing the file atomically."""
+        if not self._dirty:
+            return
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": self._entries}, f, default=str)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError:
+            pass  # Cache is best-effort
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cache file on first use."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, "r") as f:
+                    entries = json.load(f)["entries"]
+                self._entries = {
+                    k: v for k, v in entries.items()
+                    if isinstance(v.get("analysis"), dict) and isinstance(v.get("created"), (int, float))
+                }
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                pass  # Missing, unreadable or old-format cache starts empty
+        return self._entries
+
@@ -7,6 +7,17 @@ from collections import defaultdict
 from datetime import datetime, timedelta
 import re
 
+import numpy as np
+
+
+# Root-cause hints: lower-level services and failure-type messages
+_DB_SERVICE_RE = re.compile(r"db|database|postgres|mysql|redis|mongo")
+_INFRA_SERVICE_RE = re.compile(r"queue|kafka|rabbit|cache")
+_ROOT_MESSAGE_RE = re.compile(r"connection refused|timeout|unavailable")
+
+# Shared stand-in for a missing metadata dict (never mutated)
+_NO_METADATA: Dict[str, Any] = {}
+
 
 class ErrorCorrelator:
     """
@@ -36,32 +47,45 @@ class ErrorCorrelator:
         if not errors:
             return errors
         
-        # Group by trace ID if available
-        trace_groups = self._group_by_trace_id(errors)
+        times = self._timestamps(errors)
         
-        # Group by time proximity
-        time_groups = self._group_by_time(errors)
-        
-        # Find causal chains
-        chains = self._find_causal_chains(errors)
-        
-        # Add correlation metadata to errors
+        # One pass in time order assigns chain position, trace group and
+        # time group together; time order is also root-cause-first order
         correlated = []
-        for error in errors:
+        trace_to_group = {}
+        time_group = None
+        time_counter = 0
+        last_time = None
+        
+        for position, i in enumerate(self._time_order(times)):
+            error = errors[i]
+            
+            # Group by trace ID if available
+            trace_group = None
+            trace_id = (error.get("metadata") or _NO_METADATA).get("trace_id")
+            if trace_id:
+                trace_group = trace_to_group.get(trace_id)
+                if trace_group is None:
+                    trace_group = trace_to_group[trace_id] = f"trace_{len(trace_to_group)}"
+            
+            # Group by time proximity
+            current_time = times[i]
+            group = None
+            if current_time is not None:
+                if last_time is None or (current_time - last_time).total_seconds() > self.time_window:
+                    time_group = f"time_{time_counter}"
+                    time_counter += 1
+                group = time_group
+                last_time = current_time
+            
             error_copy = error.copy()
             error_copy["correlations"] = {
-                "trace_group": trace_groups.get(error.get("error_id")),
-                "time_group": time_groups.get(error.get("error_id")),
-                "chain_position": chains.get(error.get("error_id")),
+                "trace_group": trace_group,
+                "time_group": group,
+                "chain_position": position,
             }
             correlated.append(error_copy)
         
-        # Sort by likely root cause first
-        correlated.sort(key=lambda e: (
-            e["correlations"].get("chain_position", 999),
-            e.get("timestamp", "")
-        ))
-        
         return correlated
     
     def find_root_cause(self, errors: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -77,15 +101,26 @@ class ErrorCorrelator:
         if not errors:
             return None
         
-        # Score each error
-        scores = []
-        for error in errors:
-            score = self._calculate_root_cause_score(error, errors)
-            scores.append((error, score))
-        
-        # Return highest scoring error
-        scores.sort(key=lambda x: x[1], reverse=True)
-        return scores[0][0] if scores else None
+        # Earlier errors are more likely root causes; errors without a
+        # timestamp count as happening now
+        times = self._timestamps(errors)
+        known = np.array([t is not None for t in times])
+        if known.any():
+            now = datetime.now()
+            stamps = np.array([t or now for t in times], dtype="datetime64[us]")
+            min_time = stamps[known].min()
+            time_range = float((stamps[known].max() - min_time) / np.timedelta64(1, "s")) or 1
+            position = (stamps - min_time) / np.timedelta64(1, "s") / time_range
+            scores = (1 - position) * 50  # Earlier = higher score
+        else:
+            scores = np.zeros(len(errors))
+        
+        # Service and message hints, added in the same order as before
+        scores += [self._service_score(e) for e in errors]
+        scores += [self._message_score(e) for e in errors]
+        
+        # Return highest scoring error (first one on ties)
+        return errors[int(scores.argmax())]
     
     def group_related(self, errors: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
         """
@@ -100,23 +135,48 @@ class ErrorCorrelator:
         if not errors:
             return []
         
-        # Use union-find for grouping
-        parent = {i: i for i in range(len(errors))}
+        # Use union-find for grouping (iterative, so large inputs can't hit the recursion limit)
+        parent = list(range(len(errors)))
+        rank = [0] * len(errors)
         
         def find(x):
-            if parent[x] != x:
-                parent[x] = find(parent[x])
-            return parent[x]
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]  # Path splitting
+                x = parent[x]
+            return x
         
         def union(x, y):
             px, py = find(x), find(y)
-            if px != py:
-                parent[px] = py
-        
-        # Connect related errors
-        for i, error1 in enumerate(errors):
-            for j, error2 in enumerate(errors[i+1:], i+1):
-                if self._are_related(error1, error2):
+            if px == py:
+                return
+            # Union by rank: hang the shallower tree under the deeper one
+            if rank[px] < rank[py]:
+                px, py = py, px
+            parent[py] = px
+            if rank[px] == rank[py]:
+                rank[px] += 1
+        
+        # Errors sharing a trace or request ID are related outright
+        for key in ("trace_id", "request_id"):
+            buckets = defaultdict(list)
+            for i, value in enumerate(self._metadata_column(errors, key)):
+                if value:
+                    buckets[value].append(i)
+            for members in buckets.values():
+                for j in members[1:]:
+                    union(members[0], j)
+        
+        # Otherwise errors are related when close in time with similar messages;
+        # walking in time order only compares pairs inside the window
+        times = [t or datetime.now() for t in self._timestamps(errors)]
+        words = [self._message_words(e) for e in errors]
+        order = sorted(range(len(errors)), key=times.__getitem__)
+        
+        for pos, i in enumerate(order):
+            for j in order[pos + 1:]:
+                if (times[j] - times[i]).total_seconds() >= self.time_window:
+                    break
+                if find(i) != find(j) and self._word_overlap(words[i], words[j]) > 0.3:
                     union(i, j)
         
         # Group by parent
@@ -126,134 +186,49 @@ class ErrorCorrelator:
         
         return list(groups.values())
     
-    def _group_by_trace_id(self, errors: List[Dict[str, Any]]) -> Dict[str, str]:
-        """Group errors by trace ID."""
-        trace_groups = {}
-        trace_to_group = {}
-        group_counter = 0
-        
-        for error in errors:
-            trace_id = error.get("metadata", {}).get("trace_id")
-            if trace_id:
-                if trace_id not in trace_to_group:
-                    trace_to_group[trace_id] = f"trace_{group_counter}"
-                    group_counter += 1
-                trace_groups[error.get("error_id")] = trace_to_group[trace_id]
-        
-        return trace_groups
+    def _timestamps(self, errors: List[Dict[str, Any]]) -> List[Optional[datetime]]:
+        """Parse every error's timestamp once (None when it has none)."""
+        parse = self._parse_timestamp
+        return [parse(e["timestamp"]) if e.get("timestamp") else None for e in errors]
     
-    def _group_by_time(self, errors: List[Dict[str, Any]]) -> Dict[str, str]:
-        """Group errors by temporal proximity."""
-        time_groups = {}
-        group_counter = 0
-        
-        # Sort by timestamp
-        sorted_errors = sorted(errors, key=lambda e: e.get("timestamp", ""))
-        
-        current_group = None
-        last_time = None
-        
-        for error in sorted_errors:
-            timestamp_str = error.get("timestamp")
-            if not timestamp_str:
-                continue
-            
-            try:
-                # Parse timestamp (simplified)
-                current_time = self._parse_timestamp(timestamp_str)
-                
-                if last_time is None or (current_time - last_time).total_seconds() > self.time_window:
-                    current_group = f"time_{group_counter}"
-                    group_counter += 1
-                
-                time_groups[error.get("error_id")] = current_group
-                last_time = current_time
-            except:
-                pass
-        
-        return time_groups
+    @staticmethod
+    def _metadata_column(errors: List[Dict[str, Any]], key: str) -> List[Any]:
+        """One metadata field for every error (None when absent)."""
+        return [(e.get("metadata") or _NO_METADATA).get(key) for e in errors]
     
-    def _find_causal_chains(self, errors: List[Dict[str, Any]]) -> Dict[str, int]:
-        """Find causal chains (which error caused which)."""
-        chains = {}
-        
-        # Sort by timestamp
-        sorted_errors = sorted(errors, key=lambda e: e.get("timestamp", ""))
-        
-        for i, error in enumerate(sorted_errors):
-            chains[error.get("error_id")] = i
-        
-        return chains
+    @staticmethod
+    def _time_order(times: List[Optional[datetime]]) -> List[int]:
+        """Indices sorted by time, errors without a timestamp first."""
+        return sorted(
+            range(len(times)),
+            key=lambda i: (times[i] is not None, times[i] or datetime.min)
+        )
     
-    def _are_related(self, error1: Dict[str, Any], error2: Dict[str, Any]) -> bool:
-        """Check if two errors are related."""
-        # Same trace ID
-        trace1 = error1.get("metadata", {}).get("trace_id")
-        trace2 = error2.get("metadata", {}).get("trace_id")
-        if trace1 and trace2 and trace1 == trace2:
-            return True
-        
-        # Same request ID
-        req1 = error1.get("metadata", {}).get("request_id")
-        req2 = error2.get("metadata", {}).get("request_id")
-        if req1 and req2 and req1 == req2:
-            return True
-        
-        # Close in time
-        try:
-            time1 = self._parse_timestamp(error1.get("timestamp", ""))
-            time2 = self._parse_timestamp(error2.get("timestamp", ""))
-            if abs((time1 - time2).total_seconds()) < self.time_window:
-                # Check if messages are similar
-                msg1 = error1.get("message", "").lower()
-                msg2 = error2.get("message", "").lower()
-                
-                # Simple similarity: shared words
-                words1 = set(msg1.split())
-                words2 = set(msg2.split())
-                overlap = len(words1 & words2) / max(len(words1 | words2), 1)
-                
-                if overlap > 0.3:
-                    return True
-        except:
-            pass
-        
-        return False
+    @staticmethod
+    def _message_words(error: Dict[str, Any]) -> frozenset:
+        """Lowercased words of an error message."""
+        return frozenset((error.get("message") or "").lower().split())
     
-    def _calculate_root_cause_score(
-        self,
-        error: Dict[str, Any],
-        all_errors: List[Dict[str, Any]]
-    ) -> float:
-        """Calculate how likely this error is the root cause."""
-        score = 0.0
-        
-        # Earlier errors are more likely root causes
-        try:
-            timestamps = [self._parse_timestamp(e.get("timestamp", "")) for e in all_errors if e.get("timestamp")]
-            error_time = self._parse_timestamp(error.get("timestamp", ""))
-            if timestamps:
-                min_time = min(timestamps)
-                max_time = max(timestamps)
-                time_range = (max_time - min_time).total_seconds() or 1
-                position = (error_time - min_time).total_seconds() / time_range
-                score += (1 - position) * 50  # Earlier = higher score
-        except:
-            pass
-        
-        # Lower-level services are more likely root causes
-        service = error.get("service", "").lower()
-        if any(db in service for db in ["db", "database", "postgres", "mysql", "redis", "mongo"]):
-            score += 30
-        elif any(infra in service for infra in ["queue", "kafka", "rabbit", "cache"]):
-            score += 20
-        
-        # Certain error types suggest root cause
-        message = error.get("message", "").lower()
-        if any(term in message for term in ["connection refused", "timeout", "unavailable"]):
-            score += 25
-        
-        return score
+    @staticmethod
+    def _word_overlap(words1: frozenset, words2: frozenset) -> float:
+        """Simple similarity: shared words over all words."""
+        return len(words1 & words2) / max(len(words1 | words2), 1)
+    
+    @staticmethod
+    def _service_score(error: Dict[str, Any]) -> float:
+        """Root-cause hint from the service: lower-level services score higher."""
+        service = (error.get("service") or "").lower()
+        if _DB_SERVICE_RE.search(service):
+            return 30.0
+        if _INFRA_SERVICE_RE.search(service):
+            return 20.0
+        return 0.0
+    
+    @staticmethod
+    def _message_score(error: Dict[str, Any]) -> float:
+        """Root-cause hint from the message: failure types that suggest a root cause."""
+        message = (error.get("message") or "").lower()
+        return 25.0 if _ROOT_MESSAGE_RE.search(message) else 0.0
     
     def _parse_timestamp(self, timestamp_str: str) -> datetime:
         """Parse timestamp string to datetime."""
@@ -267,6 +242,14 @@ class ErrorCorrelator:
         # Clean the string
         timestamp_str = timestamp_str[:19]  # Take first 19 chars
         
+        # C-implemented ISO parser covers the common formats; strptime is the fallback.
+        # Short forms like "2024-01-15T10:00Z" keep their offset within 19 chars, so
+        # drop it: times stay naive wall-clock and comparable with each other
+        try:
+            return datetime.fromisoformat(timestamp_str).replace(tzinfo=None)
+        except ValueError:
+            pass
+        
         for fmt in formats:
             try:
                 return datetime.strptime(timestamp_str, fmt)
@@ -5,6 +5,31 @@ Timeline Builder - Generate event timelines for debugging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+import re
+
+# Relative time like "5m", "1h", "2 d"
+_TIME_DELTA_RE = re.compile(r"(\d+)\s*([mhds])")
+
+# Time unit suffix -> timedelta keyword
+_TIME_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+def _parse_iso(timestamp: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 timestamp as naive wall-clock time (None if unparseable)."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp).replace(tzinfo=None)
+    except ValueError:
+        pass
+    try:
+        return datetime.fromisoformat(timestamp[:19])
+    except ValueError:
+        return None
+
+
+def _event_time(event: Dict[str, Any]) -> datetime:
+    """Sort key: parsed timestamp, events without one first."""
+    return _parse_iso(event.get("timestamp")) or datetime.min
 
 
 class TimelineBuilder:
@@ -12,8 +37,21 @@ class TimelineBuilder:
     Builds event timelines for debugging and incident analysis.
     """
     
-    def __init__(self):
-        self._events: List[Dict[str, Any]] = []
+    def __init__(self, db=None):
+        """
+        Initialize timeline builder.
+        
+        Args:
+            db: Database to read events from (default: opened on first use)
+        """
+        self._db = db
+    
+    def _get_db(self):
+        """Return the database, opening and keeping it on first use."""
+        if self._db is None:
+            from debugai.storage.database import Database
+            self._db = Database()
+        return self._db
     
     def build(
         self,
@@ -34,9 +72,7 @@ class TimelineBuilder:
         Returns:
             List of timeline events
         """
-        from debugai.storage.database import Database
-        
-        db = Database()
+        db = self._get_db()
         
         # Parse time range
         since = self._parse_time_range(time_range)
@@ -49,8 +85,8 @@ class TimelineBuilder:
             limit=limit
         )
         
-        # Sort by timestamp
-        events.sort(key=lambda e: e.get("timestamp", ""))
+        # Sort by parsed timestamp (sort computes each key once)
+        events.sort(key=_event_time)
         
         return events
     
@@ -69,9 +105,7 @@ class TimelineBuilder:
         Returns:
             Timeline of events leading to the crash
         """
-        from debugai.storage.database import Database
-        
-        db = Database()
+        db = self._get_db()
         
         # Get error timestamp
         error_time = error.get("timestamp")
@@ -94,16 +128,17 @@ class TimelineBuilder:
             related = db.get_events_by_trace(trace_id)
             events.extend(related)
         
-        # Deduplicate and sort
+        # Deduplicate (keeping first occurrence) and sort; the message string
+        # itself is the fallback key, so no slice is allocated per event
         seen = set()
         unique_events = []
         for event in events:
-            event_id = event.get("error_id") or event.get("message", "")[:50]
+            event_id = event.get("error_id") or event.get("message") or id(event)
             if event_id not in seen:
                 seen.add(event_id)
                 unique_events.append(event)
         
-        unique_events.sort(key=lambda e: e.get("timestamp", ""))
+        unique_events.sort(key=_event_time)
         
         return unique_events
     
@@ -130,9 +165,10 @@ class TimelineBuilder:
         if not timestamps:
             return {"events": errors, "analysis": {}}
         
-        timestamps.sort()
-        start_time = timestamps[0]
-        end_time = timestamps[-1]
+        # Bounds by parsed time, each timestamp parsed once
+        dated = [(_parse_iso(t) or datetime.min, t) for t in timestamps]
+        start_time = min(dated)[1]
+        end_time = max(dated)[1]
         
         # Build timeline
         timeline = []
@@ -149,7 +185,7 @@ class TimelineBuilder:
             })
         
         # Sort timeline
-        timeline.sort(key=lambda e: e.get("timestamp", ""))
+        timeline.sort(key=_event_time)
         
         # Analyze the timeline
         analysis = self._analyze_timeline(timeline)
@@ -169,71 +205,51 @@ class TimelineBuilder:
     
     def _parse_time_delta(self, time_str: str) -> timedelta:
         """Parse time string to timedelta."""
-        time_str = time_str.lower().strip()
-        
         # Extract number and unit
-        import re
-        match = re.match(r"(\d+)\s*([mhds])", time_str)
+        match = _TIME_DELTA_RE.match(time_str.lower().strip())
         if not match:
             return timedelta(minutes=5)  # Default
         
-        value = int(match.group(1))
-        unit = match.group(2)
-        
-        if unit == "m":
-            return timedelta(minutes=value)
-        elif unit == "h":
-            return timedelta(hours=value)
-        elif unit == "d":
-            return timedelta(days=value)
-        elif unit == "s":
-            return timedelta(seconds=value)
-        
-        return timedelta(minutes=5)
+        return timedelta(**{_TIME_UNITS[match.group(2)]: int(match.group(1))})
     
     def _calculate_duration(self, start: str, end: str) -> str:
         """Calculate duration between two timestamps."""
-        try:
-            start_dt = datetime.fromisoformat(start[:19])
-            end_dt = datetime.fromisoformat(end[:19])
-            delta = end_dt - start_dt
-            
-            seconds = int(delta.total_seconds())
-            if seconds < 60:
-                return f"{seconds}s"
-            elif seconds < 3600:
-                return f"{seconds // 60}m {seconds % 60}s"
-            else:
-                hours = seconds // 3600
-                minutes = (seconds % 3600) // 60
-                return f"{hours}h {minutes}m"
-        except:
+        start_dt = _parse_iso(start)
+        end_dt = _parse_iso(end)
+        if start_dt is None or end_dt is None:
             return "unknown"
+        
+        seconds = int((end_dt - start_dt).total_seconds())
+        if seconds < 60:
+            return f"{seconds}s"
+        elif seconds < 3600:
+            return f"{seconds // 60}m {seconds % 60}s"
+        else:
+            hours = seconds // 3600
+            minutes = (seconds % 3600) // 60
+            return f"{hours}h {minutes}m"
     
     def _analyze_timeline(self, events: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Analyze a timeline for patterns."""
-        analysis = {
-            "total_events": len(events),
-            "error_count": 0,
-            "services_affected": set(),
-            "first_error": None,
-            "cascade_detected": False
-        }
+        error_count = 0
+        first_error = None
+        services = set()
         
         for event in events:
             if event.get("level") in ("error", "critical"):
-                analysis["error_count"] += 1
-                if analysis["first_error"] is None:
-                    analysis["first_error"] = event
+                error_count += 1
+                if first_error is None:
+                    first_error = event
             
             service = event.get("service")
             if service:
-                analysis["services_affected"].add(service)
-        
-        analysis["services_affected"] = list(analysis["services_affected"])
-        
-        # Detect cascade (errors in multiple services)
-        if len(analysis["services_affected"]) > 1:
-            analysis["cascade_detected"] = True
+                services.add(service)
         
-        return analysis
+        return {
+            "total_events": len(events),
+            "error_count": error_count,
+            "services_affected": list(services),
+            "first_error": first_error,
+            # Cascade: errors in multiple services
+            "cascade_detected": len(services) > 1
+        }
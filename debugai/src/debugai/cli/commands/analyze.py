@@ -10,6 +10,7 @@ Commands:
 from pathlib import Path
 from typing import Optional, List
 from enum import Enum
+from collections import Counter
 
 import typer
 from rich.console import Console
@@ -18,6 +19,7 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.tree import Tree
 from rich.syntax import Syntax
+from rich.text import Text
 from rich import box
 
 from debugai.ui import get_ui
@@ -26,6 +28,9 @@ from debugai.cli.help_theme import show_command_help
 console = Console()
 ui = get_ui()
 
+# Severity order for stream alert thresholds (unknown levels rank as info)
+_ALERT_LEVELS = {"debug": 0, "info": 1, "warn": 2, "error": 3, "critical": 4}
+
 app = typer.Typer(
     name="analyze",
     help="Analyze logs from multiple sources with AI-powered insights",
@@ -118,6 +123,11 @@ def analyze_path(
         "--ai/--no-ai",
         help="Enable AI-powered analysis",
     ),
+    use_cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        help="Reuse cached AI analyses of the same error templates",
+    ),
     output_format: OutputFormat = typer.Option(
         OutputFormat.RICH,
         "--format", "-f",
@@ -180,64 +190,67 @@ def analyze_path(
     console.print(config_table)
     console.print()
     
-    # Run analysis with progress
+    # Run analysis with one progress task advanced per phase; off a terminal
+    # Rich rendering is skipped and each phase is printed as a plain line
+    interactive = console.is_terminal
+    phases = 1 + correlate + ai_analysis
     with Progress(
         SpinnerColumn(style=primary),
         TextColumn(f"[{text_color}]" + "{task.description}" + f"[/{text_color}]"),
         BarColumn(complete_style=primary, finished_style=primary),
         TaskProgressColumn(),
         console=console,
+        disable=not interactive,
     ) as progress:
-        # Step 1: Ingest logs
-        ingest_task = progress.add_task(f"[{primary}]Ingesting logs...", total=100)
+        task = progress.add_task("", total=phases)
+        
+        def start_phase(description: str) -> None:
+            progress.update(task, description=f"[{primary}]{description}")
+            if not interactive:
+                console.print(description)
+        
+        # Steps 1-3: Ingest, parse and identify errors in one streaming pass;
+        # only the errors are kept in memory
+        start_phase("Ingesting and parsing logs...")
         
         try:
             engine = DebugEngine()
             ingester = FileIngester()
             
-            # Ingest all paths
-            all_logs = []
-            for path in paths:
-                logs = ingester.ingest(
-                    path=path,
-                    services=services,
-                    levels=levels,
-                    since=since,
-                    until=until,
-                )
-                all_logs.extend(logs)
-            
-            progress.update(ingest_task, completed=100)
-            
-            # Step 2: Parse and structure
-            parse_task = progress.add_task(f"[{primary}]Parsing log entries...", total=100)
-            parsed_logs = engine.parse_logs(all_logs)
-            progress.update(parse_task, completed=100)
+            # Large inputs are read in parallel
+            raw_logs = ingester.iter_multiple(
+                paths,
+                services=services,
+                levels=levels,
+                since=since,
+                until=until,
+                pattern=pattern,
+            )
+            errors = engine.identify_errors(engine.iter_parse_logs(raw_logs))
+            total_entries = engine.parsed_count
             
-            # Step 3: Identify errors
-            error_task = progress.add_task(f"[{primary}]Identifying errors...", total=100)
-            errors = engine.identify_errors(parsed_logs)
-            progress.update(error_task, completed=100)
+            progress.advance(task)
             
             # Step 4: Correlate errors (if enabled)
             if correlate and len(errors) > 0:
-                correlate_task = progress.add_task(f"[{primary}]Correlating errors across services...", total=100)
+                start_phase("Correlating errors across services...")
                 correlator = ErrorCorrelator()
                 correlated = correlator.correlate(errors)
-                progress.update(correlate_task, completed=100)
+                progress.advance(task)
             else:
                 correlated = errors
             
             # Step 5: AI Analysis (if enabled)
             if ai_analysis and len(correlated) > 0:
-                ai_task = progress.add_task(f"[{primary}]Running AI analysis...", total=100)
-                analysis_results = engine.ai_analyze(
-                    errors=correlated[:max_errors],
-                    context=parsed_logs,
+                start_phase("Running AI analysis...")
+                analysis_results = _ai_analyze_cached(
+                    engine, errors=correlated[:max_errors], use_cache=use_cache
                 )
-                progress.update(ai_task, completed=100)
             else:
                 analysis_results = None
+            
+            # Skipped phases count as done
+            progress.update(task, completed=phases)
         
         except Exception as e:
             console.print(f"\n[{ui.theme.error}]Analysis failed: {e}[/]")
@@ -246,7 +259,7 @@ def analyze_path(
     # Display results
     console.print()
     _display_analysis_results(
-        parsed_logs=parsed_logs,
+        total_entries=total_entries,
         errors=correlated,
         analysis=analysis_results,
         output_format=output_format,
@@ -254,7 +267,7 @@ def analyze_path(
     
     # Save report if requested
     if save_report:
-        _save_report(save_report, parsed_logs, correlated, analysis_results)
+        _save_report(save_report, total_entries, correlated, analysis_results)
         console.print(f"\n[{ui.theme.success}]Report saved to {save_report}[/]")
 
 
@@ -284,6 +297,11 @@ def analyze_docker(
         "--ai/--no-ai",
         help="Enable AI-powered analysis",
     ),
+    use_cache: bool = typer.Option(
+        True,
+        "--cache/--no-cache",
+        help="Reuse cached AI analyses of the same error templates",
+    ),
 ) -> None:
     """
     Analyze Docker container logs.
@@ -319,14 +337,8 @@ def analyze_docker(
         ) as progress:
             task = progress.add_task(f"[{primary}]Fetching Docker logs...", total=None)
             
-            all_logs = []
-            for container in containers:
-                logs = ingester.ingest(
-                    container=container,
-                    tail=tail,
-                    since=since,
-                )
-                all_logs.extend(logs)
+            # Containers are fetched concurrently (blocking Docker API calls)
+            all_logs = ingester.ingest_multiple(containers, tail=tail, since=since)
             
             progress.update(task, description=f"[{primary}]Analyzing...")
             
@@ -334,11 +346,11 @@ def analyze_docker(
             errors = engine.identify_errors(parsed)
             
             if ai_analysis and errors:
-                analysis = engine.ai_analyze(errors, parsed)
+                analysis = _ai_analyze_cached(engine, errors, parsed, use_cache=use_cache)
             else:
                 analysis = None
         
-        _display_analysis_results(parsed, errors, analysis, OutputFormat.RICH)
+        _display_analysis_results(len(parsed), errors, analysis, OutputFormat.RICH)
         
     except Exception as e:
         console.print(f"[{ui.theme.error}]Docker analysis failed: {e}[/]")
@@ -390,20 +402,45 @@ def analyze_stream(
         ingester = StreamIngester()
         engine = DebugEngine()
         
+        # Resolve the threshold once, not per error
+        threshold = _ALERT_LEVELS.get(alert_level, 2)
+        
         for batch in ingester.stream(source, buffer_size):
-            parsed = engine.parse_logs(batch)
-            errors = engine.identify_errors(parsed)
+            errors = engine.identify_errors(engine.iter_parse_logs(batch))
             
             for error in errors:
-                if _should_alert(error, alert_level):
+                if _should_alert(error, threshold):
                     _display_live_error(error)
     
     except KeyboardInterrupt:
         console.print(f"\n[{warning_color}]Stream analysis stopped[/]")
 
 
+def _ai_analyze_cached(
+    engine,
+    errors: list,
+    context: Optional[list] = None,
+    use_cache: bool = True,
+) -> dict:
+    """Run engine.ai_analyze, reusing the analysis of a batch with the same error templates."""
+    if not use_cache:
+        return engine.ai_analyze(errors=errors, context=context)
+    
+    from debugai.ai.template_cache import TemplateCache, TEMPLATE_CACHE_TTL_HOURS
+    from debugai.config.settings import Settings
+    
+    cache = TemplateCache(ttl_hours=Settings().get("storage.cache_ttl", TEMPLATE_CACHE_TTL_HOURS))
+    analysis = cache.get(errors)
+    if analysis is None:
+        analysis = engine.ai_analyze(errors=errors, context=context)
+        if not analysis.get("error"):  # Don't cache failed requests
+            cache.put(errors, analysis)
+    cache.save()
+    return analysis
+
+
 def _display_analysis_results(
-    parsed_logs: list,
+    total_entries: int,
     errors: list,
     analysis: Optional[dict],
     output_format: OutputFormat,
@@ -424,9 +461,12 @@ def _display_analysis_results(
     summary.add_column("Metric", style=primary)
     summary.add_column("Value", style=f"bold {text_color}")
     
-    summary.add_row("Total Log Entries", str(len(parsed_logs)))
-    summary.add_row("Errors Found", f"[{error_color}]{len([e for e in errors if e.get('level') == 'error'])}[/]")
-    summary.add_row("Warnings Found", f"[{warning_color}]{len([e for e in errors if e.get('level') == 'warn'])}[/]")
+    # One pass over the errors counts every level
+    level_counts = Counter(e.get("level") for e in errors)
+    
+    summary.add_row("Total Log Entries", str(total_entries))
+    summary.add_row("Errors Found", f"[{error_color}]{level_counts['error']}[/]")
+    summary.add_row("Warnings Found", f"[{warning_color}]{level_counts['warn']}[/]")
     
     if analysis:
         summary.add_row("Root Causes Identified", str(len(analysis.get('root_causes', []))))
@@ -445,11 +485,13 @@ def _display_analysis_results(
         error_table.add_column("Error", style=error_color)
         
         for i, error in enumerate(errors[:10], 1):
+            get = error.get
             error_table.add_row(
                 str(i),
-                error.get("timestamp", "Unknown"),
-                error.get("service", "Unknown"),
-                error.get("message", "Unknown error")[:60] + "..."
+                get("timestamp", "Unknown"),
+                get("service", "Unknown"),
+                # Plain Text skips markup parsing and keeps "[api]"-style brackets intact
+                Text(get("message", "Unknown error")[:60] + "...")
             )
         
         console.print(error_table)
@@ -499,28 +541,36 @@ def _display_analysis_results(
             ))
 
 
-def _save_report(path: Path, logs: list, errors: list, analysis: Optional[dict]) -> None:
+def _save_report(path: Path, total_logs: int, errors: list, analysis: Optional[dict]) -> None:
     """Save analysis report to file."""
-    import json
-    
     report = {
         "generated_at": str(Path),
-        "total_logs": len(logs),
+        "total_logs": total_logs,
         "total_errors": len(errors),
         "errors": errors,
         "analysis": analysis,
     }
     
-    with open(path, "w") as f:
-        json.dump(report, f, indent=2, default=str)
+    # orjson (C extension) when installed; the stdlib encoder otherwise
+    try:
+        import orjson
+    except ImportError:
+        import json
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+        return
+    
+    with open(path, "wb") as f:
+        f.write(orjson.dumps(
+            report,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        ))
 
 
-def _should_alert(error: dict, threshold: str) -> bool:
-    """Check if error meets alert threshold."""
-    levels = {"debug": 0, "info": 1, "warn": 2, "error": 3, "critical": 4}
-    error_level = levels.get(error.get("level", "info"), 1)
-    threshold_level = levels.get(threshold, 2)
-    return error_level >= threshold_level
+def _should_alert(error: dict, threshold: int) -> bool:
+    """Check if error meets alert threshold (a rank from _ALERT_LEVELS)."""
+    return _ALERT_LEVELS.get(error.get("level", "info"), 1) >= threshold
 
 
 def _display_live_error(error: dict) -> None:
@@ -3,6 +3,7 @@ Config Command - Manage DebugAI settings
 """
 
 from typing import Optional
+import functools
 import typer
 from rich.console import Console
 from rich.panel import Panel
@@ -16,6 +17,13 @@ ui = get_ui()
 app = typer.Typer(name="config", help="Configure DebugAI settings", no_args_is_help=False)
 
 
+@functools.lru_cache(maxsize=1)
+def _settings():
+    """Settings loaded once per process and shared by every config command."""
+    from debugai.config.settings import Settings
+    return Settings()
+
+
 @app.callback(invoke_without_command=True)
 def config_callback(
     ctx: typer.Context,
@@ -47,14 +55,12 @@ def config_set(
     value: str = typer.Argument(..., help="Configuration value"),
 ) -> None:
     """Set a configuration value."""
-    from debugai.config.settings import Settings
-    
     primary = ui.theme.primary
     error_color = ui.theme.error
     success_color = ui.theme.success
     
     try:
-        settings = Settings()
+        settings = _settings()
         settings.set(key, value)
         
         # Mask sensitive values
@@ -71,15 +77,13 @@ def config_get(
     key: str = typer.Argument(..., help="Configuration key to get"),
 ) -> None:
     """Get a configuration value."""
-    from debugai.config.settings import Settings
-    
     primary = ui.theme.primary
     text_color = ui.theme.text
     warning_color = ui.theme.warning
     error_color = ui.theme.error
     
     try:
-        settings = Settings()
+        settings = _settings()
         value = settings.get(key)
         
         if value is None:
@@ -96,15 +100,13 @@ def config_get(
 @app.command("list")
 def config_list() -> None:
     """List all configuration values."""
-    from debugai.config.settings import Settings
-    
     primary = ui.theme.primary
     text_color = ui.theme.text
     dim_color = ui.theme.dim
     error_color = ui.theme.error
     
     try:
-        settings = Settings()
+        settings = _settings()
         all_config = settings.list_all()
         
         table = Table(show_header=True, header_style=f"bold {primary}")
@@ -128,8 +130,6 @@ def config_reset(
     confirm: bool = typer.Option(False, "--yes", "-y", help="Skip confirmation"),
 ) -> None:
     """Reset all configuration to defaults."""
-    from debugai.config.settings import Settings
-    
     success_color = ui.theme.success
     warning_color = ui.theme.warning
     
@@ -137,7 +137,7 @@ def config_reset(
         confirm = typer.confirm("Reset all configuration?")
     
     if confirm:
-        settings = Settings()
+        settings = _settings()
         settings.reset()
         console.print(f"[{success_color}]Configuration reset to defaults[/]")
     else:
@@ -2,9 +2,13 @@
 Explain Command - Get plain English explanations for errors
 """
 
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from pathlib import Path
+import asyncio
+import functools
 import typer
 from rich.console import Console
+from rich.live import Live
 from rich.panel import Panel
 from rich.markdown import Markdown
 from rich import box
@@ -16,6 +20,22 @@ console = Console()
 ui = get_ui()
 app = typer.Typer(name="explain", help="Explain errors in plain English", no_args_is_help=False)
 
+# Explanation responses persist here across runs (GeminiClient's JSON response cache)
+EXPLAIN_CACHE_PATH = Path.home() / ".debugai" / "cache" / "explanations.json"
+
+
+@functools.lru_cache(maxsize=1024)
+def _lookup_error(error_id: str) -> Optional[Dict[str, Any]]:
+    """Error by ID, looked up once per process."""
+    from debugai.core.engine import DebugEngine
+    return DebugEngine().get_error_by_id(error_id)
+
+
+def _explain_client():
+    """GeminiClient whose response cache outlives the process."""
+    from debugai.ai.gemini_client import GeminiClient
+    return GeminiClient(cache_path=EXPLAIN_CACHE_PATH)
+
 
 @app.callback(invoke_without_command=True)
 def explain_callback(
@@ -35,6 +55,8 @@ def explain_callback(
             examples=[
                 "debugai explain error err_12345",
                 "debugai explain error err_12345 --verbose",
+                "debugai explain error err_12345 err_67890 err_24680",
+                "debugai explain error err_12345 err_67890 err_24680 --batch",
                 "debugai explain trace ./stacktrace.txt",
                 'debugai explain message "NullPointerException"',
             ]
@@ -44,57 +66,89 @@ def explain_callback(
 
 @app.command("error")
 def explain_error(
-    error_id: str = typer.Argument(..., help="Error ID or hash to explain"),
+    error_ids: List[str] = typer.Argument(..., help="Error ID(s) or hash(es) to explain"),
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed explanation"),
     show_code: bool = typer.Option(True, "--code/--no-code", help="Show relevant code"),
+    batch: bool = typer.Option(False, "--batch", help="Explain many errors in one Gemini Batch API job (needs google-genai)"),
 ) -> None:
-    """Explain a specific error in plain English."""
-    from debugai.core.engine import DebugEngine
-    from debugai.ai.gemini_client import GeminiClient
-    
+    """Explain one or more errors in plain English."""
     primary = ui.theme.primary
-    text_color = ui.theme.text
-    dim_color = ui.theme.dim
-    border = ui.theme.border
     error_color = ui.theme.error
-    warning_color = ui.theme.warning
-    success_color = ui.theme.success
     
-    console.print(f"\n[{primary}]Looking up error: {error_id}[/]\n")
+    error_ids = list(dict.fromkeys(error_ids))  # Each ID once, in order
+    console.print(f"\n[{primary}]Looking up error: {', '.join(error_ids)}[/]\n")
     
+    ai = None
     try:
-        engine = DebugEngine()
-        ai = GeminiClient()
+        ai = _explain_client()
         
-        error = engine.get_error_by_id(error_id)
-        if not error:
-            console.print(f"[{error_color}]Error not found: {error_id}[/]")
+        found = []
+        for error_id in error_ids:
+            error = _lookup_error(error_id)
+            if error:
+                found.append((error_id, error))
+            else:
+                console.print(f"[{error_color}]Error not found: {error_id}[/]")
+        if not found:
             raise typer.Exit(1)
         
         with console.status(f"[bold {primary}]Generating explanation..."):
-            explanation = ai.explain_error(error, verbose=verbose)
+            errors = [error for _, error in found]
+            if batch and len(errors) > 1:
+                # Opt-in: batch jobs are cheaper but can take minutes
+                # (batch_explain makes per-error calls itself below BATCH_MIN_ERRORS)
+                by_key = ai.batch_explain(errors, verbose=verbose)
+                explanations = [
+                    by_key[str(error.get("error_id") or i)] for i, error in enumerate(errors)
+                ]
+            elif len(errors) > 1:
+                # Concurrent requests, bounded by the client's concurrency and rate limits
+                explanations = asyncio.run(_explain_concurrently(ai, errors, verbose))
+            else:
+                explanations = [ai.explain_error(errors[0], verbose=verbose)]
         
-        console.print(Panel(
-            Markdown(explanation["summary"]),
-            title=f"[{primary}]What Happened[/]",
-            border_style=border
-        ))
-        
-        if verbose and explanation.get("technical_details"):
-            console.print(Panel(
-                explanation["technical_details"],
-                title=f"[{primary}]Technical Details[/]",
-                border_style=border
-            ))
-        
-        if explanation.get("similar_issues"):
-            console.print(f"\n[bold {text_color}]Similar Issues:[/]")
-            for issue in explanation["similar_issues"][:3]:
-                console.print(f"  - [{text_color}]{issue['title']}[/] - [{dim_color}]{issue['url']}[/]")
+        for (error_id, _), explanation in zip(found, explanations):
+            title = "What Happened" if len(found) == 1 else f"What Happened: {error_id}"
+            _print_explanation(explanation, title, verbose)
     
     except Exception as e:
         console.print(f"[{error_color}]Failed to explain error: {e}[/]")
         raise typer.Exit(1)
+    finally:
+        # Persist new explanations now rather than relying on the exit hook
+        if ai is not None:
+            ai.save_cache()
+
+
+async def _explain_concurrently(ai, errors: List[Dict[str, Any]], verbose: bool) -> List[Dict[str, Any]]:
+    """Explain errors with the async API, results in input order."""
+    return await asyncio.gather(*[ai.aexplain_error(error, verbose=verbose) for error in errors])
+
+
+def _print_explanation(explanation: Dict[str, Any], title: str, verbose: bool) -> None:
+    """Print one explanation: summary, technical details and similar issues."""
+    primary = ui.theme.primary
+    text_color = ui.theme.text
+    dim_color = ui.theme.dim
+    border = ui.theme.border
+    
+    console.print(Panel(
+        Markdown(explanation["summary"]),
+        title=f"[{primary}]{title}[/]",
+        border_style=border
+    ))
+    
+    if verbose and explanation.get("technical_details"):
+        console.print(Panel(
+            explanation["technical_details"],
+            title=f"[{primary}]Technical Details[/]",
+            border_style=border
+        ))
+    
+    if explanation.get("similar_issues"):
+        console.print(f"\n[bold {text_color}]Similar Issues:[/]")
+        for issue in explanation["similar_issues"][:3]:
+            console.print(f"  - [{text_color}]{issue['title']}[/] - [{dim_color}]{issue['url']}[/]")
 
 
 @app.command("text")
@@ -102,26 +156,32 @@ def explain_text(
     error_text: str = typer.Argument(..., help="Error message or stack trace to explain"),
 ) -> None:
     """Explain any error text directly."""
-    from debugai.ai.gemini_client import GeminiClient
-    
     primary = ui.theme.primary
     border = ui.theme.border
     error_color = ui.theme.error
     
     console.print(f"\n[{primary}]Analyzing error text...[/]\n")
     
+    ai = None
     try:
-        ai = GeminiClient()
+        ai = _explain_client()
         
+        def render(text: str) -> Panel:
+            return Panel(Markdown(text), title=f"[{primary}]Explanation[/]", border_style=border)
+        
+        # Wait for the first chunk under the spinner, then render the rest as it streams in
         with console.status(f"[bold {primary}]Generating explanation..."):
-            explanation = ai.explain_text(error_text)
+            chunks = ai.explain_text_stream(error_text)
+            explanation = next(chunks, "")
         
-        console.print(Panel(
-            Markdown(explanation),
-            title=f"[{primary}]Explanation[/]",
-            border_style=border
-        ))
+        with Live(render(explanation), console=console, refresh_per_second=12) as live:
+            for chunk in chunks:
+                explanation += chunk
+                live.update(render(explanation))
     
     except Exception as e:
         console.print(f"[{error_color}]Failed to explain: {e}[/]")
         raise typer.Exit(1)
+    finally:
+        if ai is not None:
+            ai.save_cache()
@@ -225,9 +225,8 @@ def doctor(
     ui.glitch_text("Running diagnostics...", duration=0.4)
     print()
     
-    ui.loading_animation("Checking system", duration=1.5)
-    
-    results = run_diagnostics()
+    with ui.loading_animation("Checking system", duration=1.5):
+        results = run_diagnostics()
     
     print()
     for check in results:
@@ -2,11 +2,48 @@
 Settings - Configuration management for DebugAI
 """
 
-from typing import Any, Optional, Dict, List
+from typing import Any, Optional, Dict, Iterator, List, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
+import hashlib
+import json
 import os
+import sys
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# The home directory does not change during a process
+_HOME = Path.home()
+
+# Parsed config files are cached as JSON under the home directory (never next to
+# the project config, where it could be committed), one file per config path and
+# keyed by a digest of the YAML bytes
+CONFIG_CACHE_DIR = _HOME / ".debugai" / "cache" / "config"
+
+# Sentinel distinguishing "missing" from a stored None
+_MISSING = object()
+
+
+def _content_digest(content: bytes) -> str:
+    """Digest identifying a config file's content in the parsed cache."""
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _cache_file(path: Path) -> Path:
+    """Parsed-cache file for a config file."""
+    return CONFIG_CACHE_DIR / f"{_content_digest(str(path.resolve()).encode('utf-8'))}.json"
+
+
+@lru_cache(maxsize=64)
+def _split_path(key: str) -> Tuple[str, ...]:
+    """Split a dotted config path, memoized since the set of paths is small."""
+    return tuple(key.split("."))
+
 
 class Settings:
     """
@@ -71,36 +108,43 @@ class Settings:
     def __init__(self):
         self._config: Dict[str, Any] = {}
         self._config_path: Optional[Path] = None
+        self._flat: Dict[str, Any] = {}
+        self._dirty = False
+        self._batch_depth = 0
         self._load_config()
     
     def _load_config(self) -> None:
         """Load configuration from all sources."""
         # Start with defaults
-        self._config = self._deep_copy(self.DEFAULTS)
+        self._config = self._clone_defaults()
         
         # Load from home directory
-        home_config = Path.home() / ".debugai" / "config.yaml"
+        home_config = _HOME / ".debugai" / "config.yaml"
         if home_config.exists():
             self._merge_config(self._load_yaml(home_config))
         
         # Load from project directory
-        project_config = Path.cwd() / ".debugai" / "config.yaml"
+        cwd = Path.cwd()
+        project_config = cwd / ".debugai" / "config.yaml"
         if project_config.exists():
             self._config_path = project_config
             self._merge_config(self._load_yaml(project_config))
         
         # Load .env file (before env vars so explicit env vars take precedence)
-        self._load_dotenv()
+        self._load_dotenv(cwd)
         
         # Override with environment variables
         self._load_env_vars()
+        
+        self._rebuild_flat()
+        self._dirty = False
     
-    def _load_dotenv(self) -> None:
+    def _load_dotenv(self, cwd: Path) -> None:
         """Load environment variables from .env file if it exists."""
         # Check current directory first, then parent directories
         env_paths = [
-            Path.cwd() / ".env",
-            Path.cwd().parent / ".env",
+            cwd / ".env",
+            cwd.parent / ".env",
         ]
         
         for env_path in env_paths:
@@ -128,12 +172,50 @@ class Settings:
                     pass  # Silently ignore errors reading .env
     
     def _load_yaml(self, path: Path) -> Dict[str, Any]:
-        """Load YAML config file."""
+        """Load YAML config file, using the parsed cache when the content is unchanged."""
         try:
-            with open(path, "r") as f:
-                return yaml.safe_load(f) or {}
+            content = path.read_bytes()
+        except OSError:
+            return {}
+        digest = _content_digest(content)
+        
+        try:
+            with open(_cache_file(path), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["digest"] == digest:
+                return cached["config"]
+        except Exception:
+            pass  # Missing or stale cache, fall through to YAML
+        
+        try:
+            data = yaml.load(content, Loader=_YamlLoader) or {}
         except Exception:
             return {}
+        
+        self._write_yaml_cache(path, data, digest)
+        return data
+    
+    def _write_yaml_cache(self, path: Path, data: Dict[str, Any], digest: Optional[str] = None) -> None:
+        """Write the parsed config cache for a YAML file."""
+        # A config holding a real API key is not cached: stripping the key would
+        # make cache hits disagree with the YAML, keeping it would copy a secret
+        ai_config = data.get("ai") if isinstance(data, dict) else None
+        if isinstance(ai_config, dict) and ai_config.get("api_key") not in (None, "", "***"):
+            return
+        
+        try:
+            if digest is None:
+                digest = _content_digest(path.read_bytes())
+            # Serialize first so values JSON can't hold (e.g. dates) leave no partial file
+            text = json.dumps({"digest": digest, "config": data})
+            cache_file = _cache_file(path)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            pass  # Cache is best-effort
     
     def _load_env_vars(self) -> None:
         """Load configuration from environment variables."""
@@ -150,13 +232,24 @@ class Settings:
             else:
                 self._config[key] = value
     
-    def _deep_copy(self, obj: Any) -> Any:
-        """Deep copy a dictionary."""
-        if isinstance(obj, dict):
-            return {k: self._deep_copy(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [self._deep_copy(item) for item in obj]
-        return obj
+    def _clone_defaults(self) -> Dict[str, Any]:
+        """Copy DEFAULTS (two levels deep, lists are the only mutable leaves)."""
+        return {
+            section: {k: (list(v) if isinstance(v, list) else v) for k, v in sub.items()}
+            for section, sub in self.DEFAULTS.items()
+        }
+    
+    def _rebuild_flat(self) -> None:
+        """Rebuild the flat lookup table for mapped keys and their dotted paths."""
+        flat: Dict[str, Any] = {}
+        for key, (section, subkey) in self.KEY_MAPPINGS.items():
+            sub = self._config.get(section)
+            if isinstance(sub, dict) and subkey in sub:
+                value = sub[subkey]
+                flat[key] = value
+                if value is not None:
+                    flat[f"{section}.{subkey}"] = value
+        self._flat = flat
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -169,14 +262,15 @@ class Settings:
         Returns:
             Configuration value
         """
-        # Check if it's a mapped key
+        # Mapped keys (and their dotted paths) are a single lookup
+        if key in self._flat:
+            return self._flat[key]
         if key in self.KEY_MAPPINGS:
-            section, subkey = self.KEY_MAPPINGS[key]
-            return self._config.get(section, {}).get(subkey, default)
+            return default
         
         # Check if it's a dotted path (e.g., "ai.model")
         if "." in key:
-            parts = key.split(".")
+            parts = _split_path(key)
             value = self._config
             for part in parts:
                 if isinstance(value, dict):
@@ -197,6 +291,11 @@ class Settings:
             value: Value to set
             save: Whether to save to config file
         """
+        # Nothing to do (or write) when the value is unchanged
+        current = self.get(key, _MISSING)
+        if current is not _MISSING and current == value:
+            return
+        
         # Check if it's a mapped key
         if key in self.KEY_MAPPINGS:
             section, subkey = self.KEY_MAPPINGS[key]
@@ -204,7 +303,7 @@ class Settings:
                 self._config[section] = {}
             self._config[section][subkey] = value
         elif "." in key:
-            parts = key.split(".")
+            parts = _split_path(key)
             config = self._config
             for part in parts[:-1]:
                 if part not in config:
@@ -214,23 +313,46 @@ class Settings:
         else:
             self._config[key] = value
         
+        self._dirty = True
+        self._rebuild_flat()
+        
         if save:
             self._save_config()
     
+    @contextmanager
+    def batch(self) -> Iterator["Settings"]:
+        """
+        Defer saving until the block exits, writing the config file at most once.
+        
+        Example:
+            with settings.batch():
+                settings.set("model", "gemini-1.5-pro")
+                settings.set("format", "json")
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self._save_config()
+    
     def list_all(self) -> List[Dict[str, Any]]:
         """List all configuration values."""
         items = []
         
+        # Mapped keys currently overridden by an environment variable
+        env_keys = {
+            mapped_key
+            for env_var, mapped_key in self.ENV_MAPPINGS.items()
+            if os.environ.get(env_var)
+        }
+        default_source = "config" if self._config_path else "default"
+        
         # Add mapped keys
         for key, (section, subkey) in self.KEY_MAPPINGS.items():
             value = self._config.get(section, {}).get(subkey)
-            source = "config" if self._config_path else "default"
-            
-            # Check if from environment
-            for env_var, mapped_key in self.ENV_MAPPINGS.items():
-                if mapped_key == key and os.environ.get(env_var):
-                    source = "environment"
-                    break
+            source = "environment" if key in env_keys else default_source
             
             items.append({
                 "key": key,
@@ -242,25 +364,44 @@ class Settings:
     
     def reset(self) -> None:
         """Reset configuration to defaults."""
-        self._config = self._deep_copy(self.DEFAULTS)
+        self._config = self._clone_defaults()
+        self._dirty = True
+        self._rebuild_flat()
         self._save_config()
     
     def _save_config(self) -> None:
-        """Save configuration to file."""
+        """Save configuration to file (skipped when unchanged or inside batch())."""
+        if not self._dirty or self._batch_depth:
+            return
+        
         if self._config_path is None:
             self._config_path = Path.cwd() / ".debugai" / "config.yaml"
             self._config_path.parent.mkdir(exist_ok=True)
         
         # Don't save API keys to file
-        save_config = self._deep_copy(self._config)
-        if "ai" in save_config and "api_key" in save_config["ai"]:
-            if save_config["ai"]["api_key"]:
-                save_config["ai"]["api_key"] = "***"  # Mask
+        save_config = dict(self._config)
+        ai_config = self._config.get("ai")
+        if isinstance(ai_config, dict) and ai_config.get("api_key"):
+            save_config["ai"] = {**ai_config, "api_key": "***"}  # Mask
         
         with open(self._config_path, "w") as f:
             yaml.dump(save_config, f, default_flow_style=False)
+        self._write_yaml_cache(self._config_path, save_config)
+        self._dirty = False
     
     @property
     def config_path(self) -> Optional[Path]:
         """Get current config file path."""
         return self._config_path
+
+
+# Intern lookup keys once so config dict lookups compare by identity
+Settings.KEY_MAPPINGS = {
+    sys.intern(k): (sys.intern(section), sys.intern(subkey))
+    for k, (section, subkey) in Settings.KEY_MAPPINGS.items()
+}
+Settings.ENV_MAPPINGS = {sys.intern(k): sys.intern(v) for k, v in Settings.ENV_MAPPINGS.items()}
+Settings.DEFAULTS = {
+    sys.intern(section): {sys.intern(k): v for k, v in sub.items()}
+    for section, sub in Settings.DEFAULTS.items()
+}
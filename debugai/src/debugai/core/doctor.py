@@ -2,23 +2,28 @@
 Doctor - Diagnose and fix common issues
 """
 
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
+import importlib.util
 import os
 import sys
 
 
 def run_diagnostics() -> List[Dict[str, Any]]:
-    """Run all diagnostic checks."""
-    checks = [
-        _check_python_version(),
-        _check_dependencies(),
-        _check_initialization(),
-        _check_api_key(),
-        _check_permissions(),
-        _check_disk_space(),
+    """Run all diagnostic checks concurrently (results keep their order)."""
+    cwd = Path.cwd()
+    checks: List[Callable[[], Dict[str, Any]]] = [
+        _check_python_version,
+        _check_dependencies,
+        lambda: _check_initialization(cwd),
+        lambda: _check_api_key(cwd),
+        lambda: _check_permissions(cwd),
+        lambda: _check_disk_space(cwd),
     ]
-    return checks
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        return list(executor.map(lambda check: check(), checks))
 
 
 def _check_python_version() -> Dict[str, Any]:
@@ -46,10 +51,16 @@ def _check_dependencies() -> Dict[str, Any]:
     }
     missing = []
     
+    # find_spec locates packages without executing them; dotted names need
+    # their parent package to resolve first
     for pkg_name, import_name in required.items():
+        parent = import_name.rpartition(".")[0]
         try:
-            __import__(import_name)
-        except ImportError:
+            if parent and importlib.util.find_spec(parent) is None:
+                missing.append(pkg_name)
+            elif importlib.util.find_spec(import_name) is None:
+                missing.append(pkg_name)
+        except (ImportError, ValueError):
             missing.append(pkg_name)
     
     if not missing:
@@ -65,9 +76,9 @@ def _check_dependencies() -> Dict[str, Any]:
     }
 
 
-def _check_initialization() -> Dict[str, Any]:
+def _check_initialization(cwd: Path) -> Dict[str, Any]:
     """Check if DebugAI is initialized."""
-    debugai_dir = Path.cwd() / ".debugai"
+    debugai_dir = cwd / ".debugai"
     
     if debugai_dir.exists():
         return {
@@ -82,7 +93,7 @@ def _check_initialization() -> Dict[str, Any]:
     }
 
 
-def _check_api_key() -> Dict[str, Any]:
+def _check_api_key(cwd: Path) -> Dict[str, Any]:
     """Check if API key is configured."""
     if os.environ.get("GEMINI_API_KEY"):
         return {
@@ -92,15 +103,16 @@ def _check_api_key() -> Dict[str, Any]:
         }
     
     # Check config
-    config_path = Path.cwd() / ".debugai" / "config.yaml"
+    config_path = cwd / ".debugai" / "config.yaml"
     if config_path.exists():
-        content = config_path.read_text()
-        if "api_key:" in content and "YOUR_API_KEY" not in content:
-            return {
-                "name": "API Key",
-                "passed": True,
-                "details": "API key found in config"
-            }
+        with config_path.open("r") as f:
+            for line in f:
+                if "api_key:" in line and "YOUR_API_KEY" not in line:
+                    return {
+                        "name": "API Key",
+                        "passed": True,
+                        "details": "API key found in config"
+                    }
     
     return {
         "name": "API Key",
@@ -109,9 +121,9 @@ def _check_api_key() -> Dict[str, Any]:
     }
 
 
-def _check_permissions() -> Dict[str, Any]:
+def _check_permissions(cwd: Path) -> Dict[str, Any]:
     """Check file permissions."""
-    debugai_dir = Path.cwd() / ".debugai"
+    debugai_dir = cwd / ".debugai"
     
     try:
         if debugai_dir.exists():
@@ -133,13 +145,23 @@ def _check_permissions() -> Dict[str, Any]:
         }
 
 
-def _check_disk_space() -> Dict[str, Any]:
+@lru_cache(maxsize=8)
+def _free_disk_gb(path: str) -> float:
+    """Free space in GB for the filesystem holding path (cached per process)."""
+    try:
+        st = os.statvfs(path)
+        free = st.f_bavail * st.f_frsize
+    except AttributeError:
+        # No statvfs on Windows
+        import shutil
+        free = shutil.disk_usage(path).free
+    return free / (1024 ** 3)
+
+
+def _check_disk_space(cwd: Path) -> Dict[str, Any]:
     """Check available disk space."""
-    import shutil
-    
     try:
-        total, used, free = shutil.disk_usage(Path.cwd())
-        free_gb = free / (1024 ** 3)
+        free_gb = _free_disk_gb(str(cwd))
         
         if free_gb > 1:
             return {
@@ -4,7 +4,7 @@ Debug Engine - Core orchestration for log analysis
 This is the main engine that coordinates all analysis operations.
 """
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, Iterable, Iterator, List, Dict, Any
 from pathlib import Path
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -56,13 +56,24 @@ class DebugEngine:
         self._parsed_logs: List[LogEntry] = []
         self._errors: List[Dict[str, Any]] = []
         self._error_index: Dict[str, Dict[str, Any]] = {}
+        self._parsed_count = 0
     
-    def parse_logs(self, raw_logs: List[Dict[str, Any]]) -> List[Any]:
+    def parse_logs(self, raw_logs: Iterable[Dict[str, Any]]) -> List[Any]:
         """Parse raw log entries into structured log objects."""
-        from debugai.ingestion.parser import LogParser, ParsedLog
+        self._parsed_logs = list(self.iter_parse_logs(raw_logs))
+        return self._parsed_logs
+    
+    def iter_parse_logs(self, raw_logs: Iterable[Dict[str, Any]]) -> Iterator[Any]:
+        """
+        Parse raw log entries lazily, one at a time.
+        
+        Entries are not kept; pipe the result into identify_errors to hold
+        only the errors in memory. parsed_count tracks how many were parsed.
+        """
+        from debugai.ingestion.parser import LogParser
         
         parser = LogParser()
-        self._parsed_logs = []
+        self._parsed_count = 0
         
         for raw in raw_logs:
             entry = parser.parse(raw)
@@ -72,11 +83,15 @@ class DebugEngine:
                     entry.error_id = self._generate_error_id(entry)
                     self._error_index[entry.error_id] = entry.to_dict()
                 
-                self._parsed_logs.append(entry)
-        
-        return self._parsed_logs
+                self._parsed_count += 1
+                yield entry
+    
+    @property
+    def parsed_count(self) -> int:
+        """Number of entries produced by the last parse."""
+        return self._parsed_count
     
-    def identify_errors(self, logs: List[Any]) -> List[Dict[str, Any]]:
+    def identify_errors(self, logs: Iterable[Any]) -> List[Dict[str, Any]]:
         """Identify and extract errors from parsed logs."""
         errors = []
         
@@ -101,7 +116,7 @@ class DebugEngine:
     def ai_analyze(
         self,
         errors: List[Dict[str, Any]],
-        context: List[LogEntry],
+        context: Optional[List[LogEntry]] = None,
         max_errors: int = 50
     ) -> Dict[str, Any]:
         """Run AI-powered analysis on errors."""
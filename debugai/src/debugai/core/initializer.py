@@ -25,23 +25,21 @@ def initialize_project(path: Optional[Path] = None) -> InitResult:
     debugai_dir = base_path / ".debugai"
     
     try:
-        # Create main directory
-        debugai_dir.mkdir(exist_ok=True)
+        # Create main directory and subdirectories
+        for sub in ("", "cache", "patterns", "reports"):
+            (debugai_dir / sub).mkdir(parents=True, exist_ok=True)
         
-        # Create subdirectories
-        (debugai_dir / "cache").mkdir(exist_ok=True)
-        (debugai_dir / "patterns").mkdir(exist_ok=True)
-        (debugai_dir / "reports").mkdir(exist_ok=True)
-        
-        # Create default config
-        config_path = debugai_dir / "config.yaml"
-        if not config_path.exists():
-            config_path.write_text(DEFAULT_CONFIG)
-        
-        # Create .gitignore
-        gitignore_path = debugai_dir / ".gitignore"
-        if not gitignore_path.exists():
-            gitignore_path.write_text("cache/\n*.db\n*.log\n")
+        # Create default config and .gitignore; exclusive mode makes the
+        # existence check and the write a single open
+        for name, content in (
+            ("config.yaml", DEFAULT_CONFIG),
+            (".gitignore", "cache/\n*.db\n*.log\n"),
+        ):
+            try:
+                with open(debugai_dir / name, "x", encoding="utf-8") as f:
+                    f.write(content)
+            except FileExistsError:
+                pass
         
         return InitResult(
             success=True,
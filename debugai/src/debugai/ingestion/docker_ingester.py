@@ -2,8 +2,95 @@
 Docker Ingester - Ingest logs from Docker containers
 """
 
-from typing import List, Dict, Any, Optional, Generator
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Generator, Tuple
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import heapq
+import re
+import sys
+import threading
+import time
+
+
+# Level keywords in one pattern; the group name is the level
+_LEVEL_RE = re.compile(
+    r"(?P<error>ERROR|FATAL|CRITICAL|EXCEPTION)|(?P<warn>WARN)|(?P<debug>DEBUG|TRACE)",
+    re.IGNORECASE,
+)
+_LEVEL_RANK = {"info": 0, "debug": 1, "warn": 2, "error": 3}
+
+# Docker logs with timestamps: "2024-01-01T00:00:00.000000000Z message".
+# One anchored match splits timestamp and message and trims whitespace;
+# level detection then scans only the message.
+_DOCKER_LINE_RE = re.compile(r"^(?P<ts>\d{4}-\S+)\s+(?P<msg>.*?)\s*$")
+
+# Transient Docker socket errors are retried with exponential backoff
+_LOGS_ATTEMPTS = 3
+_LOGS_BACKOFF = 0.1
+
+# One Docker client per process, shared by all ingesters so pooled
+# keep-alive connections are reused across parallel ingest_multiple calls
+_CLIENT = None
+_CLIENT_LOCK = threading.Lock()
+_CLIENT_POOL_SIZE = 64
+
+
+def _timestamp_key(entry: Any) -> str:
+    """Merge/sort key for log entries; entries without a timestamp sort first."""
+    return entry.get("timestamp") or ""
+
+
+@dataclass(slots=True, eq=False)
+class DockerLogEntry(Mapping):
+    """
+    Docker log line. Slotted to keep large tails compact in memory.
+    
+    Reads as a mapping with the same keys as the dicts other ingesters
+    return (an unset timestamp is a missing key).
+    """
+    raw: str
+    source: str
+    service: str
+    image: str
+    message: str
+    level: str
+    timestamp: Optional[str] = None
+    
+    _KEYS = ("raw", "source", "service", "image", "message", "level", "timestamp")
+    
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key) if key in self._KEYS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+    
+    def __iter__(self):
+        return (key for key in self._KEYS if getattr(self, key) is not None)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get value by key without the KeyError round trip of Mapping.get."""
+        value = getattr(self, key) if key in self._KEYS else None
+        return default if value is None else value
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Convert to the plain dict shape used by other ingesters."""
+        entry = {
+            "raw": self.raw,
+            "source": self.source,
+            "service": self.service,
+            "image": self.image,
+            "message": self.message,
+            "level": self.level,
+        }
+        if self.timestamp is not None:
+            entry["timestamp"] = self.timestamp
+        return entry
 
 
 class DockerIngester:
@@ -17,16 +104,38 @@ class DockerIngester:
         self._connected = False
     
     def _get_client(self):
-        """Get or create Docker client."""
+        """Get the shared Docker client, creating it on first use."""
+        global _CLIENT
+        
         if self._client is None:
-            try:
-                import docker
-                self._client = docker.from_env()
-                self._connected = True
-            except Exception as e:
-                raise RuntimeError(f"Failed to connect to Docker: {e}")
+            with _CLIENT_LOCK:
+                if _CLIENT is None:
+                    try:
+                        import docker
+                        _CLIENT = docker.from_env(timeout=5, max_pool_size=_CLIENT_POOL_SIZE)
+                    except Exception as e:
+                        raise RuntimeError(f"Failed to connect to Docker: {e}")
+            self._client = _CLIENT
+            self._connected = True
         return self._client
     
+    def _fetch_logs(self, container_obj, **kwargs) -> bytes:
+        """Fetch container logs, retrying transient transport errors."""
+        import docker.errors
+        import requests.exceptions
+        
+        for attempt in range(_LOGS_ATTEMPTS):
+            try:
+                return container_obj.logs(**kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == _LOGS_ATTEMPTS - 1:
+                    raise
+            except docker.errors.APIError as e:
+                # Client errors (e.g. 404) will not succeed on retry
+                if e.is_client_error() or attempt == _LOGS_ATTEMPTS - 1:
+                    raise
+            time.sleep(_LOGS_BACKOFF * 2 ** attempt)
+    
     def ingest(
         self,
         container: str,
@@ -34,7 +143,7 @@ class DockerIngester:
         since: Optional[str] = None,
         until: Optional[str] = None,
         follow: bool = False,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[Any]:
         """
         Ingest logs from a Docker container.
         
@@ -49,18 +158,18 @@ class DockerIngester:
             List of log entries
         """
         client = self._get_client()
-        logs = []
+        # Bounded ring buffer: no regrowth copies, and never more than tail lines
+        logs = deque(maxlen=tail if isinstance(tail, int) and tail > 0 else None)
         
         try:
             container_obj = client.containers.get(container)
             
             # Get container info
-            info = container_obj.attrs
-            service_name = info.get("Name", container).lstrip("/")
-            image = info.get("Config", {}).get("Image", "unknown")
+            service_name, image, source = self._container_identity(container_obj, container)
             
             # Fetch logs
-            log_output = container_obj.logs(
+            log_output = self._fetch_logs(
+                container_obj,
                 tail=tail,
                 timestamps=True,
                 since=since,
@@ -68,13 +177,13 @@ class DockerIngester:
                 stream=False,
             )
             
-            # Parse logs
-            for line in log_output.decode("utf-8", errors="replace").split("\n"):
-                if not line.strip():
+            # Parse logs (split raw bytes, decode per line)
+            for raw in log_output.split(b"\n"):
+                if not raw or raw.isspace():
                     continue
                 
-                entry = self._parse_docker_log(line, service_name, image)
-                logs.append(entry)
+                line = raw.decode("utf-8", errors="replace")
+                logs.append(self._parse_docker_log(line, service_name, image, source))
         
         except Exception as e:
             logs.append({
@@ -84,48 +193,107 @@ class DockerIngester:
                 "level": "error",
             })
         
-        return logs
+        return list(logs)
     
     def ingest_multiple(
         self,
         containers: List[str],
         tail: int = 1000,
         since: Optional[str] = None,
-    ) -> List[Dict[str, Any]]:
-        """Ingest logs from multiple containers."""
-        all_logs = []
+    ) -> List[Any]:
+        """Ingest logs from multiple containers concurrently."""
+        if not containers:
+            return []
         
-        for container in containers:
-            logs = self.ingest(container, tail=tail, since=since)
-            all_logs.extend(logs)
+        with ThreadPoolExecutor(max_workers=min(32, len(containers))) as executor:
+            results = list(executor.map(
+                lambda container: self.ingest(container, tail=tail, since=since),
+                containers,
+            ))
         
-        # Sort by timestamp
-        all_logs.sort(key=lambda x: x.get("timestamp", ""))
-        
-        return all_logs
+        # heapq.merge needs every input sorted by its key; Docker returns logs in
+        # time order, so this stable sort is a linear check that only moves
+        # untimestamped entries (e.g. fetch errors), which sort first
+        for container_logs in results:
+            container_logs.sort(key=_timestamp_key)
+        return list(heapq.merge(*results, key=_timestamp_key))
     
     def stream(
         self,
         container: str,
         since: Optional[str] = None,
-    ) -> Generator[Dict[str, Any], None, None]:
-        """Stream logs from a container in real-time."""
+    ) -> Generator[Any, None, None]:
+        """
+        Stream logs from a container in real-time.
+        
+        Without ``since`` this reads from an attached socket so lines arrive
+        as soon as the container writes them; with ``since`` it follows the
+        HTTP logs endpoint, which can replay history.
+        """
+        if since is None:
+            yield from self.stream_raw(container)
+            return
+        
         client = self._get_client()
         
         try:
             container_obj = client.containers.get(container)
-            service_name = container_obj.attrs.get("Name", container).lstrip("/")
-            image = container_obj.attrs.get("Config", {}).get("Image", "unknown")
+            service_name, image, source = self._container_identity(container_obj, container)
             
-            for line in container_obj.logs(
+            # Chunks may end mid-line; only complete lines are parsed
+            pending = bytearray()
+            for chunk in container_obj.logs(
                 stream=True,
                 follow=True,
                 timestamps=True,
                 since=since,
             ):
-                text = line.decode("utf-8", errors="replace").strip()
-                if text:
-                    yield self._parse_docker_log(text, service_name, image)
+                pending += chunk
+                while (newline := pending.find(b"\n")) >= 0:
+                    raw = bytes(pending[:newline])
+                    del pending[:newline + 1]
+                    if raw and not raw.isspace():
+                        line = raw.decode("utf-8", errors="replace")
+                        yield self._parse_docker_log(line, service_name, image, source)
+        
+        except Exception as e:
+            yield {
+                "raw": f"Stream error: {e}",
+                "source": f"docker:{container}",
+                "error": True,
+                "level": "error",
+            }
+    
+    def stream_raw(self, container: str) -> Generator[Any, None, None]:
+        """
+        Stream new output from an attached (hijacked) container socket.
+        
+        Attached output carries no Docker timestamps, so each line is stamped
+        with its arrival time.
+        """
+        client = self._get_client()
+        
+        try:
+            from docker.utils.socket import frames_iter
+            
+            container_obj = client.containers.get(container)
+            service_name, image, source = self._container_identity(container_obj, container)
+            tty = container_obj.attrs.get("Config", {}).get("Tty", False)
+            
+            sock = container_obj.attach_socket(
+                params={"stdout": 1, "stderr": 1, "stream": 1, "logs": 0}
+            )
+            try:
+                pending = b""
+                # frames_iter strips the 8-byte stream multiplexing headers
+                for _stream, data in frames_iter(sock, tty):
+                    *lines, pending = (pending + data).split(b"\n")
+                    for raw in lines:
+                        text = raw.decode("utf-8", errors="replace").strip()
+                        if text:
+                            yield self._parse_attached_log(text, service_name, image, source)
+            finally:
+                sock.close()
         
         except Exception as e:
             yield {
@@ -150,47 +318,67 @@ class DockerIngester:
         
         return containers
     
+    def _container_identity(self, container_obj, container: str) -> Tuple[str, str, str]:
+        """
+        Get interned (service_name, image, source) for a container.
+        
+        Computed once per container so every parsed entry shares the same
+        string objects.
+        """
+        info = container_obj.attrs
+        service_name = sys.intern(info.get("Name", container).lstrip("/"))
+        image = sys.intern(info.get("Config", {}).get("Image", "unknown"))
+        return service_name, image, sys.intern(f"docker:{service_name}")
+    
     def _parse_docker_log(
         self,
         line: str,
         service_name: str,
-        image: str
-    ) -> Dict[str, Any]:
+        image: str,
+        source: str
+    ) -> DockerLogEntry:
         """Parse a Docker log line."""
-        entry = {
-            "raw": line,
-            "source": f"docker:{service_name}",
-            "service": service_name,
-            "image": image,
-        }
-        
-        # Docker logs with timestamps: "2024-01-01T00:00:00.000000000Z message"
-        if line and len(line) > 30 and line[4] == "-":
-            try:
-                timestamp_str = line[:30].strip()
-                message = line[31:].strip()
-                entry["timestamp"] = timestamp_str
-                entry["message"] = message
-                entry["raw"] = message
-            except:
-                entry["message"] = line
+        match = _DOCKER_LINE_RE.match(line)
+        if match:
+            timestamp, message = match.group("ts", "msg")
         else:
-            entry["message"] = line
+            timestamp, message = None, line
         
-        # Detect level
-        entry["level"] = self._detect_level(entry.get("message", line))
-        
-        return entry
+        return DockerLogEntry(
+            raw=message,
+            source=source,
+            service=service_name,
+            image=image,
+            message=message,
+            level=self._detect_level(message),
+            timestamp=timestamp,
+        )
+    
+    def _parse_attached_log(
+        self,
+        line: str,
+        service_name: str,
+        image: str,
+        source: str
+    ) -> DockerLogEntry:
+        """Parse an attached-socket line: the whole line is the message, stamped on arrival."""
+        return DockerLogEntry(
+            raw=line,
+            source=source,
+            service=service_name,
+            image=image,
+            message=line,
+            level=self._detect_level(line),
+            timestamp=datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+        )
     
     def _detect_level(self, message: str) -> str:
-        """Detect log level from message."""
-        msg_upper = message.upper()
-        
-        if any(word in msg_upper for word in ["ERROR", "FATAL", "CRITICAL", "EXCEPTION"]):
-            return "error"
-        elif any(word in msg_upper for word in ["WARN", "WARNING"]):
-            return "warn"
-        elif any(word in msg_upper for word in ["DEBUG", "TRACE"]):
-            return "debug"
-        
-        return "info"
+        """Detect log level from message (most severe keyword wins)."""
+        level = "info"
+        for match in _LEVEL_RE.finditer(message):
+            found = match.lastgroup
+            if found == "error":
+                return found
+            if _LEVEL_RANK[found] > _LEVEL_RANK[level]:
+                level = found
+        return level
@@ -3,12 +3,39 @@ File Ingester - Ingest logs from files and directories
 """
 
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Generator
+from typing import Iterable, List, Dict, Any, Optional, Generator, Tuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+import functools
+import itertools
 import os
 import gzip
 import re
 from datetime import datetime
 
+# Below this much file data, worker startup and result pickling cost more
+# than reading the files in parallel saves
+PARALLEL_MIN_BYTES = 8 * 1024 * 1024
+# Files read ahead per worker; bounds how many parsed files wait in memory
+PARALLEL_READ_AHEAD = 2
+
+try:
+    import re2  # Linear-time matching for user-supplied --pattern regexes
+except ImportError:
+    re2 = None
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_pattern(pattern: str):
+    """Compile a --pattern once per process, with RE2 when it accepts the syntax."""
+    if re2 is not None:
+        try:
+            return re2.compile("(?i)" + pattern)
+        except Exception:
+            pass  # e.g. backreferences, which RE2 doesn't support
+    return re.compile(pattern, re.IGNORECASE)
+
 
 class FileIngester:
     """
@@ -60,6 +87,64 @@ class FileIngester:
         
         return logs
     
+    def ingest_multiple(
+        self,
+        paths: Iterable[Path],
+        services: Optional[List[str]] = None,
+        levels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Ingest logs from several files or directories.
+        
+        Large inputs spanning several files are read in parallel worker
+        processes; results keep the order a sequential ingest would give.
+        See iter_multiple to consume entries without building the full list.
+        
+        Args:
+            paths: Paths to files or directories
+            services: Filter by service names
+            levels: Filter by log levels
+            since: Start time filter
+            until: End time filter
+            pattern: Regex pattern to match
+            max_workers: Worker processes (default: CPU count)
+        
+        Returns:
+            List of raw log entries
+        """
+        return list(self.iter_multiple(
+            paths, services, levels, since, until, pattern, max_workers
+        ))
+    
+    def iter_multiple(
+        self,
+        paths: Iterable[Path],
+        services: Optional[List[str]] = None,
+        levels: Optional[List[str]] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        pattern: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Like ingest_multiple, but yields entries file by file instead of building one list."""
+        files = []
+        for path in paths:
+            if path.is_file():
+                files.append(path)
+            elif path.is_dir():
+                files.extend(self._log_files(path))
+            else:
+                raise FileNotFoundError(f"Path not found: {path}")
+        
+        # Filters apply per entry, so each file is filtered where it is read
+        filters = (services, levels, since, until, pattern)
+        for file_logs in self._read_files(files, filters, max_workers):
+            yield from file_logs
+    
     def ingest_streaming(
         self,
         path: Path,
@@ -104,10 +189,63 @@ class FileIngester:
         """Recursively read all log files in a directory."""
         logs = []
         
+        for file_path in self._log_files(path):
+            logs.extend(self._read_file(file_path))
+        
+        return logs
+    
+    def _log_files(self, path: Path) -> Generator[Path, None, None]:
+        """Supported log files under a directory, recursively."""
         for file_path in path.rglob("*"):
             if file_path.is_file() and file_path.suffix in self.SUPPORTED_EXTENSIONS:
-                logs.extend(self._read_file(file_path))
+                yield file_path
+    
+    def _read_files(
+        self,
+        files: List[Path],
+        filters: Tuple,
+        max_workers: Optional[int] = None
+    ) -> Generator[List[Dict[str, Any]], None, None]:
+        """Read and filter files in order, in worker processes when there is enough data to pay off."""
+        try:
+            total_bytes = sum(f.stat().st_size for f in files)
+        except OSError:
+            total_bytes = 0
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(files))
+        if workers < 2 or total_bytes < PARALLEL_MIN_BYTES:
+            for f in files:
+                yield self._read_filtered(f, filters)
+            return
         
+        # spawn, not fork: callers (e.g. Rich progress) may have threads running
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as executor:
+            # Submit in a sliding window instead of executor.map, which queues
+            # every file at once and holds all finished results until consumed
+            remaining = iter(files)
+            pending = deque(
+                executor.submit(_read_file_task, f, filters)
+                for f in itertools.islice(remaining, workers * PARALLEL_READ_AHEAD)
+            )
+            try:
+                while pending:
+                    file_logs, file_count, line_count = pending.popleft().result()
+                    f = next(remaining, None)
+                    if f is not None:
+                        pending.append(executor.submit(_read_file_task, f, filters))
+                    self._file_count += file_count
+                    self._line_count += line_count
+                    yield file_logs
+            finally:
+                # Consumer stopped early: don't read files nobody will see
+                for future in pending:
+                    future.cancel()
+    
+    def _read_filtered(self, path: Path, filters: Tuple) -> List[Dict[str, Any]]:
+        """Read a single log file and apply (services, levels, since, until, pattern)."""
+        logs = self._read_file(path)
+        if any(filters):
+            logs = self._filter_logs(logs, *filters)
         return logs
     
     def _iter_file(self, path: Path) -> Generator[Dict[str, Any], None, None]:
@@ -130,12 +268,7 @@ class FileIngester:
         """Parse content from a file handle."""
         logs = []
         service_name = self._detect_service_from_path(path)
-        
-        # Check if it's JSON logs (one JSON per line)
-        first_line = file_handle.readline()
-        file_handle.seek(0)
-        
-        is_json = first_line.strip().startswith("{")
+        source = str(path)  # One string shared by every entry of the file
         
         for line_num, line in enumerate(file_handle, 1):
             line = line.strip()
@@ -146,7 +279,7 @@ class FileIngester:
             
             entry = {
                 "raw": line,
-                "source": str(path),
+                "source": source,
                 "line_number": line_num,
                 "service": service_name,
             }
@@ -223,8 +356,8 @@ class FileIngester:
             filtered = [l for l in filtered if l.get("level") in levels]
         
         if pattern:
-            regex = re.compile(pattern, re.IGNORECASE)
-            filtered = [l for l in filtered if regex.search(l.get("raw", ""))]
+            search = _compile_pattern(pattern).search
+            filtered = [l for l in filtered if search(l.get("raw", ""))]
         
         # Time filtering would require parsing timestamps
         # Simplified for now
@@ -238,3 +371,10 @@ class FileIngester:
             "files_processed": self._file_count,
             "lines_processed": self._line_count,
         }
+
+
+def _read_file_task(path: Path, filters: Tuple) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Read and filter one file in a worker process, returning its logs and stats."""
+    ingester = FileIngester()
+    logs = ingester._read_filtered(path, filters)
+    return logs, ingester._file_count, ingester._line_count
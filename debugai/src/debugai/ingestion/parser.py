@@ -8,6 +8,18 @@ from datetime import datetime
 import re
 import json
 
+# Timestamp cleanup before strptime: fractional seconds, trailing Z, UTC offset
+_FRACTION_RE = re.compile(r"\.\d+")
+_ZULU_RE = re.compile(r"Z$")
+_OFFSET_RE = re.compile(r"[+-]\d{2}:\d{2}$")
+
+# Correlation IDs in text logs
+_TRACE_ID_RE = re.compile(r"trace[_-]?id[=:]\s*([a-f0-9-]+)", re.I)
+_REQUEST_ID_RE = re.compile(r"request[_-]?id[=:]\s*([a-f0-9-]+)", re.I)
+
+# Separator punctuation left at the start of a message
+_LEADING_PUNCT_RE = re.compile(r"^\s*[-:\[\]]+\s*")
+
 
 @dataclass
 class ParsedLog:
@@ -60,6 +72,10 @@ class LogParser:
         (r"\b(DEBUG|TRACE)\b", "debug"),
     ]
     
+    # Compiled once; every line runs through all of these
+    _TIMESTAMP_RES = [(re.compile(pattern), fmt) for pattern, fmt in TIMESTAMP_PATTERNS]
+    _LEVEL_RES = [(re.compile(pattern, re.I), level) for pattern, level in LEVEL_PATTERNS]
+    
     def __init__(self):
         self._custom_patterns: List[tuple] = []
     
@@ -115,12 +131,12 @@ class LogParser:
         metadata = {}
         
         # Extract trace IDs
-        trace_match = re.search(r"trace[_-]?id[=:]\s*([a-f0-9-]+)", raw, re.I)
+        trace_match = _TRACE_ID_RE.search(raw)
         if trace_match:
             metadata["trace_id"] = trace_match.group(1)
         
         # Extract request IDs
-        req_match = re.search(r"request[_-]?id[=:]\s*([a-f0-9-]+)", raw, re.I)
+        req_match = _REQUEST_ID_RE.search(raw)
         if req_match:
             metadata["request_id"] = req_match.group(1)
         
@@ -135,17 +151,17 @@ class LogParser:
     
     def _extract_timestamp(self, text: str) -> Optional[datetime]:
         """Extract timestamp from text."""
-        for pattern, fmt in self.TIMESTAMP_PATTERNS:
-            match = re.search(pattern, text)
+        for pattern, fmt in self._TIMESTAMP_RES:
+            match = pattern.search(text)
             if match:
                 ts_str = match.group(1)
                 try:
                     if fmt:
                         # Handle various formats
                         ts_str = ts_str.replace(",", ".")
-                        ts_str = re.sub(r"\.\d+", "", ts_str)  # Remove microseconds
-                        ts_str = re.sub(r"Z$", "", ts_str)    # Remove Z
-                        ts_str = re.sub(r"[+-]\d{2}:\d{2}$", "", ts_str)  # Remove timezone
+                        ts_str = _FRACTION_RE.sub("", ts_str)  # Remove microseconds
+                        ts_str = _ZULU_RE.sub("", ts_str)      # Remove Z
+                        ts_str = _OFFSET_RE.sub("", ts_str)    # Remove timezone
                         return datetime.strptime(ts_str[:19], fmt[:len(ts_str)])
                 except:
                     pass
@@ -164,8 +180,8 @@ class LogParser:
     
     def _extract_level(self, text: str) -> str:
         """Extract log level from text."""
-        for pattern, level in self.LEVEL_PATTERNS:
-            if re.search(pattern, text, re.I):
+        for pattern, level in self._LEVEL_RES:
+            if pattern.search(text):
                 return level
         return "info"
     
@@ -189,15 +205,15 @@ class LogParser:
     def _extract_message(self, text: str) -> str:
         """Extract the main message from log text."""
         # Remove timestamp
-        for pattern, _ in self.TIMESTAMP_PATTERNS:
-            text = re.sub(pattern, "", text)
+        for pattern, _ in self._TIMESTAMP_RES:
+            text = pattern.sub("", text)
         
         # Remove level
-        for pattern, _ in self.LEVEL_PATTERNS:
-            text = re.sub(pattern, "", text, flags=re.I)
+        for pattern, _ in self._LEVEL_RES:
+            text = pattern.sub("", text)
         
         # Clean up
-        text = re.sub(r"^\s*[-:\[\]]+\s*", "", text)
+        text = _LEADING_PUNCT_RE.sub("", text)
         text = text.strip()
         
         return text or "No message"
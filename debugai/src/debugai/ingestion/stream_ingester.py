@@ -3,10 +3,59 @@ Stream Ingester - Ingest logs from streams (stdin, files, URLs)
 """
 
 from typing import List, Dict, Any, Optional, Generator
+from concurrent.futures import ThreadPoolExecutor
+import io
+import os
+import queue
+import re
 import sys
+import threading
 import time
 
 
+# Level keywords in one pattern; the group name is the level
+_LEVEL_RE = re.compile(r"(?P<error>ERROR|FATAL)|(?P<warn>WARN)|(?P<debug>DEBUG)", re.IGNORECASE)
+_LEVEL_RANK = {"info": 0, "debug": 1, "warn": 2, "error": 3}
+
+# Adaptive batch sizing: buffer_size is the ceiling; a batch may use at most
+# this share of available memory, assuming roughly this many bytes per entry
+_CHUNK_MEMORY_SHARE = 0.01
+_ENTRY_SIZE_ESTIMATE = 1024
+# Re-read memory stats every N lines to amortize the cost
+_CHUNK_RECOMPUTE_EVERY = 32
+
+
+def _detect_level(line: str) -> str:
+    """Detect the most severe level keyword in one case-insensitive scan."""
+    level = "info"
+    for match in _LEVEL_RE.finditer(line):
+        found = match.lastgroup
+        if found == "error":
+            return found
+        if _LEVEL_RANK[found] > _LEVEL_RANK[level]:
+            level = found
+    return level
+
+
+def _memory_stats() -> Optional[tuple]:
+    """Return (available, total) bytes of system memory, or None if unknown."""
+    try:
+        import psutil
+        vm = psutil.virtual_memory()
+        return vm.available, vm.total
+    except ImportError:
+        pass
+    
+    try:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        return (
+            os.sysconf("SC_AVPHYS_PAGES") * page_size,
+            os.sysconf("SC_PHYS_PAGES") * page_size,
+        )
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
 class StreamIngester:
     """
     Ingests logs from streaming sources.
@@ -15,6 +64,8 @@ class StreamIngester:
     
     def __init__(self):
         self._buffer = []
+        self._chunk_target = 100
+        self._lines_seen = 0
     
     def stream(
         self,
@@ -31,13 +82,46 @@ class StreamIngester:
         Yields:
             Batches of log entries
         """
+        self._chunk_target = self._recompute_chunk(buffer_size)
+        self._lines_seen = 0
+        
         if source == "stdin":
             yield from self._stream_stdin(buffer_size)
-        elif source.startswith("http://") or source.startswith("https://"):
+        elif source.startswith(("http://", "https://")):
             yield from self._stream_http(source, buffer_size)
         else:
             yield from self._stream_file(source, buffer_size)
     
+    def _recompute_chunk(self, buffer_size: int) -> int:
+        """
+        Size batches from memory pressure, down to 1/4 of buffer_size.
+        
+        buffer_size is never exceeded; batches only shrink when memory is tight.
+        """
+        stats = _memory_stats()
+        if not stats or not stats[1]:
+            return buffer_size
+        
+        available, total = stats
+        pressure = 1 - available / total
+        if pressure > 0.9:
+            factor = 0.25
+        elif pressure > 0.8:
+            factor = 0.5
+        else:
+            factor = 1.0
+        
+        memory_cap = available * _CHUNK_MEMORY_SHARE / _ENTRY_SIZE_ESTIMATE
+        target = int(min(buffer_size * factor, memory_cap))
+        return min(buffer_size, max(1, buffer_size // 4, target))
+    
+    def _buffer_full(self, buffer: List[Dict[str, Any]], buffer_size: int) -> bool:
+        """Check whether a batch should be yielded, refreshing the adaptive size."""
+        self._lines_seen += 1
+        if self._lines_seen % _CHUNK_RECOMPUTE_EVERY == 0:
+            self._chunk_target = self._recompute_chunk(buffer_size)
+        return len(buffer) >= self._chunk_target
+    
     def _stream_stdin(
         self,
         buffer_size: int
@@ -51,7 +135,7 @@ class StreamIngester:
                 if line:
                     buffer.append(self._parse_line(line, "stdin"))
                 
-                if len(buffer) >= buffer_size:
+                if self._buffer_full(buffer, buffer_size):
                     yield buffer
                     buffer = []
         except KeyboardInterrupt:
@@ -68,33 +152,71 @@ class StreamIngester:
         """Stream from a file (tail -f style)."""
         buffer = []
         
+        # Block on filesystem events instead of polling when watchdog is available
+        changed = threading.Event()
+        observer = self._watch_file(path, changed)
+        idle_wait = 1.0 if observer else 0.1
+        
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
+            with open(path, "rb") as f:
                 # Go to end of file
                 f.seek(0, 2)
                 
+                # Read in blocks; only complete lines are decoded, a trailing
+                # partial line waits in pending for the rest of its bytes
+                pending = b""
                 while True:
-                    line = f.readline()
+                    chunk = f.read(io.DEFAULT_BUFFER_SIZE)
                     
-                    if line:
-                        line = line.strip()
-                        if line:
-                            buffer.append(self._parse_line(line, path))
-                        
-                        if len(buffer) >= buffer_size:
-                            yield buffer
-                            buffer = []
+                    if chunk:
+                        *lines, pending = (pending + chunk).split(b"\n")
+                        for raw in lines:
+                            line = raw.decode("utf-8", errors="replace").strip()
+                            if line:
+                                buffer.append(self._parse_line(line, path))
+                            
+                            if self._buffer_full(buffer, buffer_size):
+                                yield buffer
+                                buffer = []
                     else:
                         if buffer:
                             yield buffer
                             buffer = []
-                        time.sleep(0.1)
+                        changed.wait(idle_wait)
+                        changed.clear()
         except KeyboardInterrupt:
             pass
+        finally:
+            if observer:
+                observer.stop()
+                observer.join()
         
         if buffer:
             yield buffer
     
+    def _watch_file(self, path: str, changed: threading.Event):
+        """Start a watchdog observer that sets ``changed`` when path changes."""
+        try:
+            from watchdog.observers import Observer
+            from watchdog.events import FileSystemEventHandler
+        except ImportError:
+            return None
+        
+        target = os.path.abspath(path)
+        
+        class FileChangeHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if os.path.abspath(event.src_path) == target:
+                    changed.set()
+        
+        try:
+            observer = Observer()
+            observer.schedule(FileChangeHandler(), os.path.dirname(target), recursive=False)
+            observer.start()
+        except Exception:
+            return None
+        return observer
+    
     def _stream_http(
         self,
         url: str,
@@ -111,7 +233,7 @@ class StreamIngester:
                     if line:
                         buffer.append(self._parse_line(line, url))
                     
-                    if len(buffer) >= buffer_size:
+                    if self._buffer_full(buffer, buffer_size):
                         yield buffer
                         buffer = []
         except Exception as e:
@@ -150,28 +272,61 @@ class StreamIngester:
                 def __init__(self, callback):
                     self.callback = callback
                     self._file_positions = {}
+                    self._handles = {}
+                    # Reads happen off the observer thread; one lock per path
+                    # keeps drains of the same file in order
+                    self._executor = ThreadPoolExecutor(max_workers=4)
+                    self._locks = {}
+                
+                def _handle(self, path):
+                    """Get the open handle for path, reopening after rotation."""
+                    f = self._handles.get(path)
+                    if f is not None and os.fstat(f.fileno()).st_ino != os.stat(path).st_ino:
+                        f.close()
+                        f = None
+                        self._file_positions[path] = 0
+                    if f is None:
+                        f = self._handles[path] = open(path, "rb", buffering=io.DEFAULT_BUFFER_SIZE)
+                    return f
                 
                 def on_modified(self, event):
                     if event.is_directory:
                         return
                     
-                    path = event.src_path
-                    pos = self._file_positions.get(path, 0)
-                    
+                    self._executor.submit(self._drain, event.src_path)
+                
+                def _drain(self, path):
+                    with self._locks.setdefault(path, threading.Lock()):
+                        self._read_new_lines(path)
+                
+                def _read_new_lines(self, path):
                     try:
-                        with open(path, "r") as f:
-                            f.seek(pos)
-                            for line in f:
-                                self.callback(line.strip(), path)
-                            self._file_positions[path] = f.tell()
+                        f = self._handle(path)
+                        pos = self._file_positions.get(path, 0)
+                        if os.fstat(f.fileno()).st_size < pos:
+                            pos = 0  # Truncated
+                        f.seek(pos)
+                        data = f.read()
+                        # Consume complete lines only; a partial line is re-read later
+                        end = data.rfind(b"\n") + 1
+                        for raw in data[:end].split(b"\n")[:-1]:
+                            line = raw.decode("utf-8", errors="replace").strip()
+                            if line:
+                                self.callback(line, path)
+                        self._file_positions[path] = pos + end
                     except:
                         pass
+                
+                def close(self):
+                    self._executor.shutdown(wait=True)
+                    for f in self._handles.values():
+                        f.close()
+                    self._handles.clear()
             
-            entries = []
+            entries = queue.Queue()
             
             def callback(line, path):
-                entry = self._parse_line(line, path)
-                entries.append(entry)
+                entries.put(self._parse_line(line, path))
             
             observer = Observer()
             handler = LogHandler(callback)
@@ -181,15 +336,19 @@ class StreamIngester:
             
             observer.start()
             
+            # finally also runs when the consumer breaks out or closes the generator
             try:
                 while True:
-                    while entries:
-                        yield entries.pop(0)
-                    time.sleep(0.1)
+                    try:
+                        yield entries.get(timeout=1.0)
+                    except queue.Empty:
+                        continue
             except KeyboardInterrupt:
+                pass
+            finally:
                 observer.stop()
-            
-            observer.join()
+                observer.join()
+                handler.close()
         
         except ImportError:
             # Fallback without watchdog
@@ -198,21 +357,9 @@ class StreamIngester:
     
     def _parse_line(self, line: str, source: str) -> Dict[str, Any]:
         """Parse a single log line."""
-        entry = {
+        return {
             "raw": line,
             "source": source,
             "message": line,
+            "level": _detect_level(line),
         }
-        
-        # Detect level
-        line_upper = line.upper()
-        if "ERROR" in line_upper or "FATAL" in line_upper:
-            entry["level"] = "error"
-        elif "WARN" in line_upper:
-            entry["level"] = "warn"
-        elif "DEBUG" in line_upper:
-            entry["level"] = "debug"
-        else:
-            entry["level"] = "info"
-        
-        return entry
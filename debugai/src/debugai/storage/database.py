@@ -9,6 +9,12 @@ import sqlite3
 import json
 import os
 
+# Applied to every new connection: 64 MB page cache, 256 MB memory-mapped reads
+_CONNECTION_PRAGMAS = (
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
 
 class Database:
     """
@@ -36,6 +42,8 @@ class Database:
         if self._connection is None:
             self._connection = sqlite3.connect(self.db_path)
             self._connection.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS:
+                self._connection.execute(pragma)
         return self._connection
     
     def _init_db(self) -> None:
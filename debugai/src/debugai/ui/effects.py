@@ -6,21 +6,78 @@ import time
 import random
 import sys
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Iterator, TYPE_CHECKING
 from enum import Enum
 from dataclasses import dataclass
+from functools import lru_cache
+from rich.color import ColorSystem
 from rich.console import Console
 from rich.text import Text
-from rich.panel import Panel
 from rich.style import Style
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
+
+if TYPE_CHECKING:
+    from rich.progress import Progress
 
 
 # Theme config file path
 THEME_CONFIG_PATH = Path.home() / ".debugai_theme"
 
+# Raw terminal sequences for animation frames (written directly, bypassing Rich)
+CLEAR_LINE = "\r\033[K"
+RESET = "\033[0m"
+
+# Serializes background spinner frames with other direct stdout writes
+_STDOUT_LOCK = threading.Lock()
+
+_COLOR_SYSTEMS = {
+    "standard": ColorSystem.STANDARD,
+    "256": ColorSystem.EIGHT_BIT,
+    "truecolor": ColorSystem.TRUECOLOR,
+    "windows": ColorSystem.WINDOWS,
+}
+
+
+@lru_cache(maxsize=64)
+def _box_borders(text_len: int) -> tuple:
+    """Build (top, middle template, bottom) box lines for a header of text_len chars."""
+    border = "═" * (text_len + 4)
+    return f"╔{border}╗", "║  {}  ║", f"╚{border}╝"
+
+
+@lru_cache(maxsize=64)
+def _rule(char: str, width: int) -> str:
+    """Build a horizontal rule of width chars."""
+    return char * width
+
+
+def _paced(count: int, frame_budget: float):
+    """Yield frame indices on a monotonic schedule of one frame per frame_budget.
+    
+    Sleeps only for whatever is left of each frame after rendering, and drops
+    frames once the caller falls more than a frame behind, so slow terminals
+    don't stretch the animation past its intended duration.
+    """
+    deadline = time.monotonic()
+    for i in range(count):
+        if time.monotonic() - deadline > frame_budget:
+            deadline += frame_budget
+            continue
+        yield i
+        deadline += frame_budget
+        time.sleep(max(0.0, deadline - time.monotonic()))
+
+
+def _animations_supported() -> bool:
+    """Check whether stdout is an interactive terminal worth animating."""
+    try:
+        is_tty = sys.stdout.isatty()
+    except Exception:
+        is_tty = False
+    return is_tty and os.environ.get("TERM") != "dumb" and not os.environ.get("CI")
+
 
 def save_theme_preference(theme_name: str) -> None:
     """Save theme preference to config file."""
@@ -28,8 +85,10 @@ def save_theme_preference(theme_name: str) -> None:
         THEME_CONFIG_PATH.write_text(theme_name.lower())
     except Exception:
         pass  # Silently fail if can't save
+    load_theme_preference.cache_clear()
 
 
+@lru_cache(maxsize=1)
 def load_theme_preference() -> Optional[str]:
     """Load saved theme preference."""
     try:
@@ -150,17 +209,106 @@ class UIEffects:
     """Animation and visual effects for CLI"""
     
     GLITCH_CHARS = "!@#$%^&*()_+-=[]{}|;':\",./<>?`~"
+    SCRAMBLE_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    _GLITCH_POOL = tuple(GLITCH_CHARS)
+    _SCRAMBLE_POOL = tuple(SCRAMBLE_CHARS)
     
     def __init__(self, console: Optional[Console] = None, theme: Themes = Themes.CYAN):
         self.console = console or Console()
+        # Animations only print plain text, so skip Rich's markup/highlight/emoji passes
+        self._fast_console = Console(
+            file=self.console.file,
+            color_system=self.console.color_system,
+            force_terminal=self.console.is_terminal,
+            no_color=self.console.no_color,
+            markup=False,
+            highlight=False,
+            emoji=False,
+            soft_wrap=True,
+        )
         self.theme = theme.value
-        self.animations_enabled = True
+        # Animating into a pipe, log file or CI runner only writes escape-code noise
+        self.animations_enabled = _animations_supported()
+        self._ansi_cache: dict = {}
+        self._saved_theme_name = load_theme_preference()
+        self._prepare_theme()
+    
+    def _ansi(self, color: str) -> str:
+        """Get the ANSI escape that starts a color (empty when output has no color)."""
+        code = self._ansi_cache.get(color)
+        if code is None:
+            color_system = _COLOR_SYSTEMS.get(self.console.color_system or "")
+            if color_system is None or self.console.no_color:
+                code = ""
+            else:
+                rendered = Style.parse(color).render("\0", color_system=color_system)
+                code = rendered[:rendered.index("\0")]
+            self._ansi_cache[color] = code
+        return code
+    
+    def _frame_writer(self) -> Callable[[str], None]:
+        """Get a function that writes raw animation frames straight to the stdout fd.
+        
+        Falls back to sys.stdout.write + flush when stdout has no real file
+        descriptor, and on Windows, where the console needs text writes to
+        render box-drawing and braille characters.
+        """
+        sys.stdout.flush()  # Keep ordering with anything already buffered
+        try:
+            fd = None if sys.platform == "win32" else sys.stdout.fileno()
+        except (AttributeError, OSError, ValueError):
+            fd = None
+        
+        if fd is None:
+            def write(frame: str) -> None:
+                sys.stdout.write(frame)
+                sys.stdout.flush()
+            return write
+        
+        encoding = sys.stdout.encoding or "utf-8"
+        
+        def write_fd(frame: str) -> None:
+            # os.write may write only part of a frame (e.g. to a full pipe)
+            data = memoryview(frame.encode(encoding, "replace"))
+            while data:
+                data = data[os.write(fd, data):]
+        return write_fd
+    
+    def _print_plain(self, text: str, color: str) -> None:
+        """Print text in a single color without markup parsing."""
+        self._fast_console.print(Text(text, style=color))
+    
+    def _prepare_theme(self) -> None:
+        """Resolve the current theme's colors, status colors and message prefixes up front."""
+        for color in (self.theme.primary, self.theme.text, self.theme.dim, self.theme.border):
+            self._ansi(color)
+        self._status_colors = {
+            "ok": self.theme.success,
+            "error": self.theme.error,
+            "warning": self.theme.warning,
+            "info": self.theme.primary
+        }
+        self._prefixes = {
+            "success": Text("[OK] ", style=self.theme.success),
+            "error": Text("[ERROR] ", style=self.theme.error),
+            "warning": Text("[WARN] ", style=self.theme.warning),
+            "info": Text("[INFO] ", style=self.theme.text),
+        }
+    
+    def _print_prefixed(self, kind: str, text: str) -> None:
+        """Print a message after its cached, theme-colored prefix."""
+        line = self._prefixes[kind].copy()
+        line.append(text)
+        self.console.print(line)
     
     def set_theme(self, theme: Themes, save: bool = True) -> None:
         """Change the current theme and optionally save preference"""
         self.theme = theme.value
-        if save:
-            save_theme_preference(theme.name.lower())
+        self._prepare_theme()
+        theme_name = theme.name.lower()
+        if save and theme_name != self._saved_theme_name:
+            save_theme_preference(theme_name)
+            self._saved_theme_name = theme_name
     
     def disable_animations(self) -> None:
         """Disable animations for non-interactive use"""
@@ -174,165 +322,188 @@ class UIEffects:
     
     def glitch_text(self, text: str, duration: float = 0.5, final_color: Optional[str] = None) -> None:
         """Display text with glitch animation effect"""
+        color = final_color or self.theme.primary
         if not self.animations_enabled:
-            self.console.print(f"[{final_color or self.theme.primary}]{text}[/]")
+            self._print_plain(text, color)
             return
         
-        color = final_color or self.theme.primary
         iterations = int(duration * 20)
-        text_len = len(text)
+        write = self._frame_writer()
         
-        for i in range(iterations):
-            glitched = ""
+        for i in _paced(iterations, 0.025):
             glitch_intensity = 1 - (i / iterations)  # Decreases over time
+            glitched = self._glitch_line(text, glitch_intensity * 0.7)
+            display_color = self._flicker_color(color, glitch_intensity)
             
-            for char in text:
-                if char == " ":
-                    glitched += " "
-                elif random.random() < glitch_intensity * 0.7:
-                    glitched += random.choice(self.GLITCH_CHARS)
-                else:
-                    glitched += char
-            
-            # Random color flicker during glitch
-            if random.random() < glitch_intensity * 0.3:
-                display_color = random.choice(["red", "green", "blue", "yellow", "magenta"])
-            else:
-                display_color = color
-            
-            # Clear line and print (works better in Windows)
+            # Clear line and write the frame directly (works better in Windows)
             padding = " " * 5  # Extra padding to clear
-            sys.stdout.write(f"\r\033[K")  # Clear line
-            self.console.print(f"[{display_color}]{glitched}[/{display_color}]{padding}", end="")
-            sys.stdout.flush()
-            time.sleep(0.025)
+            write(f"{CLEAR_LINE}{self._ansi(display_color)}{glitched}{RESET}{padding}")
         
         # Final clean text on new line
-        sys.stdout.write(f"\r\033[K")  # Clear line
-        self.console.print(f"[{color}]{text}[/{color}]")
+        write(CLEAR_LINE)
+        self._print_plain(text, color)
+    
+    def _glitch_line(self, text: str, threshold: float) -> str:
+        """Replace non-space characters with glitch glyphs at the given rate."""
+        # One batched draw of replacement glyphs per frame
+        noise = random.choices(self._GLITCH_POOL, k=len(text))
+        roll = random.random
+        return "".join(
+            glyph if char != " " and roll() < threshold else char
+            for char, glyph in zip(text, noise)
+        )
+    
+    def _flicker_color(self, color: str, glitch_intensity: float) -> str:
+        """Random color flicker during glitch"""
+        if random.random() < glitch_intensity * 0.3:
+            return random.choice(["red", "green", "blue", "yellow", "magenta"])
+        return color
+    
+    def _glitch_block(self, lines: List[str], duration: float, color: str) -> None:
+        """Glitch several lines at once, redrawing the whole block in one write per frame."""
+        iterations = int(duration * 20)
+        rewind = f"\033[{len(lines) - 1}F" if len(lines) > 1 else ""  # Back to first row
+        write = self._frame_writer()
+        
+        for i in _paced(iterations, 0.025):
+            glitch_intensity = 1 - (i / iterations)
+            threshold = glitch_intensity * 0.7
+            code = self._ansi(self._flicker_color(color, glitch_intensity))
+            frame = "\n".join(
+                f"{CLEAR_LINE}{code}{self._glitch_line(line, threshold)}{RESET}" for line in lines
+            )
+            write(frame + rewind)
+        
+        write(CLEAR_LINE)
+        self._print_plain("\n".join(lines), color)
     
     def typewriter(self, text: str, speed: float = 0.03, color: Optional[str] = None) -> None:
         """Display text with typewriter effect"""
+        color = color or self.theme.text
         if not self.animations_enabled:
-            self.console.print(f"[{color or self.theme.text}]{text}[/]")
+            self._print_plain(text, color)
             return
         
-        color = color or self.theme.text
-        for i, char in enumerate(text):
-            self.console.print(f"[{color}]{char}[/]", end="")
+        # Color is set once for the whole run; only the characters are written per step
+        write = self._frame_writer()
+        write(self._ansi(color))
+        deadline = time.monotonic()
+        for char in text:
+            write(char)
             
             # Variable speed for natural feel
             if char in ".!?":
-                time.sleep(speed * 5)
+                deadline += speed * 5
             elif char == ",":
-                time.sleep(speed * 2)
+                deadline += speed * 2
             elif char == " ":
-                time.sleep(speed * 0.5)
+                deadline += speed * 0.5
             else:
-                time.sleep(speed)
+                deadline += speed
+            time.sleep(max(0.0, deadline - time.monotonic()))
         
-        self.console.print()  # Newline at end
+        write(RESET)
+        self._fast_console.print()  # Newline at end
     
     def reveal_text(self, text: str, duration: float = 0.3, color: Optional[str] = None) -> None:
         """Reveal text character by character with fade effect"""
+        color = color or self.theme.text
         if not self.animations_enabled:
-            self.console.print(f"[{color or self.theme.text}]{text}[/]")
+            self._print_plain(text, color)
             return
         
-        color = color or self.theme.text
         delay = duration / len(text) if text else 0
         
-        for i in range(len(text) + 1):
+        color_code = self._ansi(color)
+        dim_code = self._ansi(self.theme.dim)
+        write = self._frame_writer()
+        for i in _paced(len(text) + 1, delay):
             visible = text[:i]
             hidden = "░" * (len(text) - i)
-            sys.stdout.write(f"\r\033[K")  # Clear line
-            self.console.print(f"[{color}]{visible}[/][{self.theme.dim}]{hidden}[/]", end="")
-            sys.stdout.flush()
-            time.sleep(delay)
+            write(f"{CLEAR_LINE}{color_code}{visible}{RESET}{dim_code}{hidden}{RESET}")
         
-        sys.stdout.write(f"\r\033[K")
-        self.console.print(f"[{color}]{text}[/]")
+        write(CLEAR_LINE)
+        self._print_plain(text, color)
     
     def scramble_reveal(self, text: str, duration: float = 0.5, color: Optional[str] = None) -> None:
         """Reveal text with scrambling effect (like hacking scenes)"""
+        color = color or self.theme.primary
         if not self.animations_enabled:
-            self.console.print(f"[{color or self.theme.primary}]{text}[/]")
+            self._print_plain(text, color)
             return
         
-        color = color or self.theme.primary
-        chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
         iterations = int(duration * 30)
-        revealed = [False] * len(text)
+        text_len = len(text)
+        revealed = [False] * text_len
+        color_code = self._ansi(color)
+        roll = random.random
+        write = self._frame_writer()
         
-        for iteration in range(iterations):
-            output = ""
+        for iteration in _paced(iterations, duration / iterations if iterations else 0):
             # Reveal more characters as we progress
-            reveal_chance = iteration / iterations
+            threshold = (iteration / iterations) * 0.3
             
-            for i, char in enumerate(text):
-                if revealed[i]:
-                    output += char
-                elif char == " ":
-                    output += " "
-                    revealed[i] = True
-                elif random.random() < reveal_chance * 0.3:
-                    output += char
-                    revealed[i] = True
-                else:
-                    output += random.choice(chars)
+            revealed = [
+                shown or char == " " or roll() < threshold
+                for char, shown in zip(text, revealed)
+            ]
             
-            sys.stdout.write(f"\r\033[K")  # Clear line
-            self.console.print(f"[{color}]{output}[/]", end="")
-            sys.stdout.flush()
-            time.sleep(duration / iterations)
+            noise = random.choices(self._SCRAMBLE_POOL, k=text_len)
+            output = "".join(
+                char if shown else glyph
+                for char, shown, glyph in zip(text, revealed, noise)
+            )
+            
+            write(f"{CLEAR_LINE}{color_code}{output}{RESET}")
         
         # Final clean text
-        sys.stdout.write(f"\r\033[K")
-        self.console.print(f"[{color}]{text}[/]")
+        write(CLEAR_LINE)
+        self._print_plain(text, color)
     
     # ============= STYLED COMPONENTS =============
     
     def header(self, text: str, animate: bool = True) -> None:
         """Display animated header"""
-        border = "═" * (len(text) + 4)
+        top, middle, bottom = _box_borders(len(text))
         
         if animate and self.animations_enabled:
-            self.glitch_text(f"╔{border}╗", duration=0.2, final_color=self.theme.border)
-            self.glitch_text(f"║  {text}  ║", duration=0.3, final_color=self.theme.primary)
-            self.glitch_text(f"╚{border}╝", duration=0.2, final_color=self.theme.border)
+            self.glitch_text(top, duration=0.2, final_color=self.theme.border)
+            self.glitch_text(middle.format(text), duration=0.3, final_color=self.theme.primary)
+            self.glitch_text(bottom, duration=0.2, final_color=self.theme.border)
         else:
-            self.console.print(f"[{self.theme.border}]╔{border}╗[/]")
+            self.console.print(f"[{self.theme.border}]{top}[/]")
             self.console.print(f"[{self.theme.border}]║[/]  [{self.theme.primary}]{text}[/]  [{self.theme.border}]║[/]")
-            self.console.print(f"[{self.theme.border}]╚{border}╝[/]")
+            self.console.print(f"[{self.theme.border}]{bottom}[/]")
     
     def subheader(self, text: str) -> None:
         """Display subheader with line"""
-        line = "─" * 40
+        line = _rule("─", 40)
         self.console.print(f"\n[{self.theme.primary}]┌─ {text}[/]")
         self.console.print(f"[{self.theme.dim}]{line}[/]")
     
     def success(self, text: str, animate: bool = False) -> None:
         """Display success message"""
-        self.console.print(f"[{self.theme.success}][OK] {text}[/]")
+        self._print_prefixed("success", text)
     
     def error(self, text: str, animate: bool = False) -> None:
         """Display error message"""
-        self.console.print(f"[{self.theme.error}][ERROR] {text}[/]")
+        self._print_prefixed("error", text)
     
     def warning(self, text: str) -> None:
         """Display warning message"""
-        self.console.print(f"[{self.theme.warning}][WARN] {text}[/]")
+        self._print_prefixed("warning", text)
     
     def info(self, text: str, animate: bool = False) -> None:
         """Display info message"""
-        self.console.print(f"[{self.theme.text}][INFO] {text}[/]")
+        self._print_prefixed("info", text)
     
     def dim(self, text: str) -> None:
         """Display dimmed text"""
-        self.console.print(f"[{self.theme.dim}]{text}[/]")
+        self.console.print(Text(text, style=self.theme.dim))
     
     def panel(self, content: str, title: str = "", border_style: Optional[str] = None) -> None:
         """Display a themed panel"""
+        from rich.panel import Panel
         style = border_style or self.theme.border
         self.console.print(Panel(
             content,
@@ -343,6 +514,7 @@ class UIEffects:
     
     def table(self, headers: List[str], rows: List[List[str]], title: str = "") -> None:
         """Display a themed table"""
+        from rich.table import Table
         table = Table(
             title=f"[bold {self.theme.primary}]{title}[/]" if title else None,
             header_style=f"bold {self.theme.primary}",
@@ -359,8 +531,9 @@ class UIEffects:
         
         self.console.print(table)
     
-    def progress_bar(self, description: str = "Processing") -> Progress:
+    def progress_bar(self, description: str = "Processing") -> "Progress":
         """Get a themed progress bar"""
+        from rich.progress import Progress, SpinnerColumn, TextColumn
         return Progress(
             SpinnerColumn(style=self.theme.primary),
             TextColumn(f"[{self.theme.text}]{description}...[/]"),
@@ -369,60 +542,79 @@ class UIEffects:
     
     def divider(self, char: str = "─", width: int = 50) -> None:
         """Display a divider line"""
-        self.console.print(f"[{self.theme.dim}]{char * width}[/]")
+        self.console.print(f"[{self.theme.dim}]{_rule(char, width)}[/]")
     
     # ============= SPECIAL EFFECTS =============
     
-    def loading_animation(self, text: str = "Loading", duration: float = 2.0) -> None:
-        """Display loading animation"""
+    @contextmanager
+    def loading_animation(self, text: str = "Loading", duration: float = 0.0) -> Iterator[None]:
+        """Spin a loading indicator in the background while the with-block runs.
+        
+        The spinner stays up for at least `duration` seconds.
+        """
         if not self.animations_enabled:
-            self.console.print(f"[{self.theme.primary}]{text}...[/]")
+            self._print_plain(f"{text}...", self.theme.primary)
+            yield
             return
         
         frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
-        end_time = time.time() + duration
-        i = 0
+        primary_code = self._ansi(self.theme.primary)
+        label = f" {self._ansi(self.theme.text)}{text}...{RESET}"
+        stop = threading.Event()
+        write = self._frame_writer()
         
-        while time.time() < end_time:
-            frame = frames[i % len(frames)]
-            sys.stdout.write(f"\r\033[K")  # Clear line
-            self.console.print(f"[{self.theme.primary}]{frame}[/] [{self.theme.text}]{text}...[/]", end="")
-            sys.stdout.flush()
-            time.sleep(0.1)
-            i += 1
+        def spin() -> None:
+            i = 0
+            deadline = time.monotonic()
+            while not stop.is_set():
+                with _STDOUT_LOCK:
+                    write(f"{CLEAR_LINE}{primary_code}{frames[i % len(frames)]}{RESET}{label}")
+                i += 1
+                deadline += 0.1
+                stop.wait(max(0.0, deadline - time.monotonic()))
         
-        sys.stdout.write(f"\r\033[K")  # Clear line
-        self.console.print(f"[{self.theme.success}]✓[/] [{self.theme.text}]{text}[/]")
+        min_end = time.monotonic() + duration
+        spinner = threading.Thread(target=spin, name="debugai-spinner", daemon=True)
+        spinner.start()
+        try:
+            yield
+        except BaseException:
+            stop.set()
+            spinner.join()
+            with _STDOUT_LOCK:
+                write(CLEAR_LINE)
+            raise
+        
+        remaining = min_end - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+        stop.set()
+        spinner.join()
+        with _STDOUT_LOCK:
+            write(CLEAR_LINE)
+            self._fast_console.print(Text.assemble(("✓", self.theme.success), " ", (text, self.theme.text)))
     
     def banner(self, lines: List[str], animate: bool = True) -> None:
         """Display ASCII art banner with animation"""
         if animate and self.animations_enabled:
-            for line in lines:
-                self.glitch_text(line, duration=0.1, final_color=self.theme.primary)
-                time.sleep(0.05)
+            self._glitch_block(lines, duration=0.1 * len(lines), color=self.theme.primary)
         else:
-            for line in lines:
-                self.console.print(f"[{self.theme.primary}]{line}[/]")
+            self._print_plain("\n".join(lines), self.theme.primary)
     
     def status_line(self, label: str, value: str, status: str = "ok") -> None:
         """Display a status line with label and value"""
-        status_colors = {
-            "ok": self.theme.success,
-            "error": self.theme.error,
-            "warning": self.theme.warning,
-            "info": self.theme.primary
-        }
-        color = status_colors.get(status, self.theme.text)
+        color = self._status_colors.get(status, self.theme.text)
         
-        dots = "." * (40 - len(label) - len(value))
-        self.console.print(
-            f"[{self.theme.text}]{label}[/]"
-            f"[{self.theme.dim}]{dots}[/]"
-            f"[{color}]{value}[/]"
-        )
+        dots = _rule(".", max(0, 40 - len(label) - len(value)))
+        self._fast_console.print(Text.assemble(
+            (label, self.theme.text),
+            (dots, self.theme.dim),
+            (value, color)
+        ))
     
     def code_block(self, code: str, language: str = "python") -> None:
         """Display syntax-highlighted code block"""
+        from rich.panel import Panel
         from rich.syntax import Syntax
         syntax = Syntax(code, language, theme="monokai", line_numbers=True)
         self.console.print(Panel(syntax, border_style=self.theme.border))
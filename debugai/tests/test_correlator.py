@@ -0,0 +1,36 @@
+"""
+Tests for ErrorCorrelator with mixed timestamp formats
+"""
+
+from debugai.analysis.correlator import ErrorCorrelator
+
+MIXED = [
+    {"timestamp": "2024-01-15T10:00:30", "service": "api", "message": "request failed: db timeout"},
+    {"timestamp": "2024-01-15T10:00Z", "service": "db", "message": "db timeout on query"},
+    {"timestamp": "2024-01-15T10:01+0000", "service": "api", "message": "request failed: db timeout"},
+    {"timestamp": "2024-01-15 10:00:10", "service": "cache", "message": "evicted keys"},
+]
+
+
+def test_offset_timestamps_parse_as_naive_wall_clock():
+    parsed = ErrorCorrelator()._parse_timestamp("2024-01-15T10:00Z")
+    
+    assert parsed.tzinfo is None
+    assert parsed.isoformat() == "2024-01-15T10:00:00"
+
+
+def test_correlate_handles_mixed_timestamps():
+    correlated = ErrorCorrelator().correlate(MIXED)
+    
+    assert [e["service"] for e in correlated] == ["db", "cache", "api", "api"]
+    assert [e["correlations"]["chain_position"] for e in correlated] == [0, 1, 2, 3]
+
+
+def test_group_related_handles_mixed_timestamps():
+    groups = ErrorCorrelator().group_related(MIXED)
+    
+    assert sorted(len(g) for g in groups) == [1, 3]
+
+
+def test_find_root_cause_handles_mixed_timestamps():
+    assert ErrorCorrelator().find_root_cause(MIXED)["service"] == "db"
@@ -0,0 +1,106 @@
+"""
+Tests for Docker log ingestion (no Docker daemon needed)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from debugai.ingestion.docker_ingester import DockerIngester
+
+
+def test_ingest_multiple_merges_in_time_order(monkeypatch):
+    ingester = DockerIngester()
+    per_container = {
+        "api": [
+            {"timestamp": "2024-01-01T00:00:03Z", "message": "a3"},
+            {"message": "no timestamp"},
+            {"timestamp": "2024-01-01T00:00:01Z", "message": "a1"},
+        ],
+        "db": [
+            {"timestamp": "2024-01-01T00:00:02Z", "message": "d2"},
+            {"raw": "Error fetching logs from db", "error": True},
+        ],
+    }
+    monkeypatch.setattr(ingester, "ingest", lambda container, **kwargs: list(per_container[container]))
+    
+    merged = ingester.ingest_multiple(["api", "db"])
+    
+    timestamps = [e.get("timestamp") for e in merged]
+    assert timestamps[:2] == [None, None]
+    assert timestamps[2:] == ["2024-01-01T00:00:01Z", "2024-01-01T00:00:02Z", "2024-01-01T00:00:03Z"]
+
+
+def test_attached_line_keeps_its_own_date():
+    line = "2024-01-15 10:00:00 ERROR db down"
+    entry = DockerIngester()._parse_attached_log(line, "db", "postgres", "docker:db")
+    
+    assert entry.message == line
+    assert entry.raw == line
+    assert entry.level == "error"
+    # Stamped with the arrival time, not a token taken from the line
+    arrived = datetime.strptime(entry.timestamp, "%Y-%m-%dT%H:%M:%S.%fZ")
+    assert abs(datetime.now(timezone.utc).replace(tzinfo=None) - arrived) < timedelta(minutes=1)
+
+
+class _FakeContainer:
+    attrs = {"Name": "/api", "Config": {"Image": "api:latest"}}
+
+
+class _FakeClient:
+    class containers:
+        @staticmethod
+        def get(container):
+            return _FakeContainer()
+
+
+def _ingest(monkeypatch, log_output):
+    ingester = DockerIngester()
+    monkeypatch.setattr(ingester, "_get_client", lambda: _FakeClient())
+    monkeypatch.setattr(ingester, "_fetch_logs", lambda container_obj, **kwargs: log_output)
+    return ingester.ingest("api")
+
+
+def test_ingest_splits_short_rfc3339_timestamp(monkeypatch):
+    (entry,) = _ingest(monkeypatch, b"2024-01-01T00:00:00Z ERROR short ts message here\n")
+    
+    assert entry.get("timestamp") == "2024-01-01T00:00:00Z"
+    assert entry.get("message") == "ERROR short ts message here"
+    assert entry.get("level") == "error"
+
+
+def test_ingest_splits_nanosecond_timestamp(monkeypatch):
+    (entry,) = _ingest(monkeypatch, b"2024-01-01T00:00:00.123456789Z WARN slow query\n")
+    
+    assert entry.get("timestamp") == "2024-01-01T00:00:00.123456789Z"
+    assert entry.get("message") == "WARN slow query"
+    assert entry.get("level") == "warn"
+
+
+def test_entries_read_like_dicts(monkeypatch):
+    (entry,) = _ingest(monkeypatch, b"2024-01-01T00:00:00Z ERROR db down\n")
+    expected = {
+        "raw": "ERROR db down",
+        "source": "docker:api",
+        "service": "api",
+        "image": "api:latest",
+        "message": "ERROR db down",
+        "level": "error",
+        "timestamp": "2024-01-01T00:00:00Z",
+    }
+    
+    assert entry["message"] == "ERROR db down"
+    assert dict(entry) == expected == entry.as_dict()
+    assert entry == expected
+    assert list(entry.keys()) == list(expected)
+    assert "timestamp" in entry
+
+
+def test_missing_timestamp_is_a_missing_key():
+    entry = DockerIngester()._parse_docker_log("no timestamp here", "api", "api:latest", "docker:api")
+    
+    assert "timestamp" not in entry
+    assert entry.get("timestamp", "") == ""
+    assert len(entry) == 6
+    with pytest.raises(KeyError):
+        entry["timestamp"]
@@ -0,0 +1,49 @@
+"""
+Tests for the raw animation frame writer
+"""
+
+import io
+import sys
+
+from debugai.ui import effects
+from debugai.ui.effects import UIEffects
+
+
+class _FdStdout(io.StringIO):
+    encoding = "utf-8"
+    
+    def fileno(self):
+        return 99
+
+
+def test_frame_writer_finishes_partial_writes(monkeypatch):
+    written = bytearray()
+    
+    def short_write(fd, data):
+        # Accept at most 3 bytes per call, like a nearly full pipe
+        written.extend(bytes(data[:3]))
+        return len(data[:3])
+    
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(sys, "stdout", _FdStdout())
+    monkeypatch.setattr(effects.os, "write", short_write)
+    
+    frame = "\r░░▓▓ ⠋ ═══ loading"
+    UIEffects._frame_writer(None)(frame)
+    
+    assert written.decode("utf-8") == frame
+
+
+def test_frame_writer_uses_text_stdout_on_windows(monkeypatch):
+    stdout = _FdStdout()
+    
+    def fail_write(fd, data):
+        raise AssertionError("raw fd write on Windows")
+    
+    monkeypatch.setattr(sys, "platform", "win32")
+    monkeypatch.setattr(sys, "stdout", stdout)
+    monkeypatch.setattr(effects.os, "write", fail_write)
+    
+    UIEffects._frame_writer(None)("⠋ ═══")
+    
+    assert stdout.getvalue() == "⠋ ═══"
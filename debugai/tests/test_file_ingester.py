@@ -0,0 +1,52 @@
+"""
+Tests for FileIngester's parallel file reading
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from debugai.ingestion import file_ingester
+from debugai.ingestion.file_ingester import PARALLEL_READ_AHEAD, FileIngester
+
+NO_FILTERS = (None, None, None, None, None)
+
+
+class _CountingExecutor(ThreadPoolExecutor):
+    """Thread stand-in for the process pool that counts submitted files."""
+    
+    submitted = 0
+    
+    def __init__(self, max_workers, mp_context=None):
+        super().__init__(max_workers=max_workers)
+    
+    def submit(self, fn, *args):
+        type(self).submitted += 1
+        return super().submit(fn, *args)
+
+
+def _log_files(tmp_path, count):
+    files = []
+    for i in range(count):
+        path = tmp_path / f"app{i:02d}.log"
+        path.write_text(f"ERROR request {i} failed\nINFO request {i} retried\n")
+        files.append(path)
+    return files
+
+
+def test_parallel_read_is_bounded_and_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_ingester, "PARALLEL_MIN_BYTES", 0)
+    monkeypatch.setattr(file_ingester, "ProcessPoolExecutor", _CountingExecutor)
+    monkeypatch.setattr(_CountingExecutor, "submitted", 0)
+    files = _log_files(tmp_path, 20)
+    
+    ingester = FileIngester()
+    batches = ingester._read_files(files, NO_FILTERS, max_workers=2)
+    first = next(batches)
+    
+    # Only a window of files is queued ahead of the consumer
+    assert _CountingExecutor.submitted == 2 * PARALLEL_READ_AHEAD + 1
+    
+    rest = list(batches)
+    sequential = FileIngester()
+    assert [first] + rest == [sequential._read_filtered(f, NO_FILTERS) for f in files]
+    assert ingester._file_count == sequential._file_count
+    assert ingester._line_count == sequential._line_count
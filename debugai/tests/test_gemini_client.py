@@ -0,0 +1,201 @@
+"""
+Tests for GeminiClient paths that don't need network access
+"""
+
+import asyncio
+import gc
+import json
+import sys
+import time
+import types
+from types import SimpleNamespace
+
+from debugai.ai import gemini_client
+from debugai.ai.gemini_client import BATCH_MIN_ERRORS, GeminiClient
+
+
+class _StalledBatches:
+    def __init__(self):
+        self.cancelled = []
+    
+    def create(self, model, src):
+        return SimpleNamespace(name="batches/1", state=SimpleNamespace(name="JOB_STATE_RUNNING"))
+    
+    def get(self, name):
+        return self.create(None, None)
+    
+    def cancel(self, name):
+        self.cancelled.append(name)
+
+
+def test_batch_explain_falls_back_after_timeout(monkeypatch):
+    batches = _StalledBatches()
+    fake_client = SimpleNamespace(
+        files=SimpleNamespace(upload=lambda file, config: SimpleNamespace(name="files/1")),
+        batches=batches,
+    )
+    google = types.ModuleType("google")
+    google.genai = SimpleNamespace(Client=lambda api_key: fake_client)
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setattr(gemini_client, "BATCH_POLL_INTERVAL", 0.01)
+    
+    client = GeminiClient(api_key="test", cache_size=0)
+    monkeypatch.setattr(client, "explain_error", lambda error, verbose=False: {"summary": error["message"]})
+    errors = [{"error_id": f"err_{i}", "message": f"boom {i}"} for i in range(BATCH_MIN_ERRORS)]
+    
+    results = client.batch_explain(errors, timeout=0.05)
+    
+    assert batches.cancelled == ["batches/1"]
+    assert results == {f"err_{i}": {"summary": f"boom {i}"} for i in range(BATCH_MIN_ERRORS)}
+
+
+def test_batch_explain_serves_cached_responses_without_a_job(monkeypatch, tmp_path):
+    def no_batch_client(api_key):
+        raise AssertionError("batch job submitted for cached errors")
+    
+    google = types.ModuleType("google")
+    google.genai = SimpleNamespace(Client=no_batch_client)
+    monkeypatch.setitem(sys.modules, "google", google)
+    
+    path = tmp_path / "responses.json"
+    errors = [{"error_id": f"err_{i}", "message": f"boom {i}"} for i in range(BATCH_MIN_ERRORS)]
+    earlier = GeminiClient(api_key="test", cache_path=path)
+    for error in errors:
+        model = _FakeModel(f"cached {error['error_id']}")
+        earlier._generate(model, earlier._explanation_prompt(error, False))
+    earlier.save_cache()
+    
+    client = GeminiClient(api_key="test", cache_path=path)
+    monkeypatch.setattr(client, "explain_error", lambda error, verbose=False: {"summary": "called"})
+    
+    results = client.batch_explain(errors)
+    
+    assert list(results) == [error["error_id"] for error in errors]
+    assert all("cached" in result["summary"] for result in results.values())
+
+
+class _FakeModel:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+    
+    def generate_content(self, prompt):
+        self.calls += 1
+        return SimpleNamespace(text=f"{self.name}: {prompt}")
+
+
+def test_response_cache_is_keyed_by_model(tmp_path):
+    path = tmp_path / "responses.json"
+    flash = GeminiClient(api_key="test", model="flash", cache_path=path)
+    pro = GeminiClient(api_key="test", model="pro", cache_path=path)
+    
+    assert flash._generate(_FakeModel("flash"), "why?") == "flash: why?"
+    flash.save_cache()
+    assert pro._generate(_FakeModel("pro"), "why?") == "pro: why?"
+
+
+def test_response_cache_persists_as_json_on_save(tmp_path):
+    path = tmp_path / "cache" / "responses.json"
+    client = GeminiClient(api_key="test", cache_path=path)
+    model = _FakeModel("flash")
+    
+    client._generate(model, "a")
+    client._generate(model, "b")
+    assert not path.exists()  # Nothing written per response
+    client.save_cache()
+    
+    reloaded = GeminiClient(api_key="test", cache_path=path)
+    other_model = _FakeModel("flash")
+    assert reloaded._generate(other_model, "a") == "flash: a"
+    assert other_model.calls == 0
+    assert json.loads(path.read_text()) == {
+        client._prompt_key("a"): "flash: a",
+        client._prompt_key("b"): "flash: b",
+    }
+
+
+class _SlowAsyncModel:
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+    
+    async def generate_content_async(self, prompt):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.02)
+        self.in_flight -= 1
+        return SimpleNamespace(text=f"answer: {prompt[-8:]}")
+
+
+def _async_client(monkeypatch, model, **limits):
+    client = GeminiClient(api_key="test", cache_size=0, **limits)
+    monkeypatch.setattr(client, "_get_model", lambda: model)
+    return client
+
+
+async def test_async_explanations_respect_max_concurrent(monkeypatch):
+    model = _SlowAsyncModel()
+    client = _async_client(monkeypatch, model, max_concurrent=2)
+    errors = [{"message": f"boom {i}"} for i in range(6)]
+    
+    results = await asyncio.gather(*[client.aexplain_error(e) for e in errors])
+    
+    assert model.peak == 2
+    assert all(r["summary"].startswith("answer") for r in results)
+
+
+async def test_async_explanations_wait_for_the_rate_limit(monkeypatch):
+    client = _async_client(monkeypatch, _SlowAsyncModel(), requests_per_minute=600)
+    client._limiter._requests = 0  # Bucket drained: 10 requests per second from here
+    
+    start = time.monotonic()
+    await asyncio.gather(*[client.aexplain_error({"message": f"boom {i}"}) for i in range(3)])
+    
+    assert time.monotonic() - start >= 0.25
+
+
+async def test_zero_rate_limits_mean_unlimited(monkeypatch):
+    client = _async_client(monkeypatch, _SlowAsyncModel(), requests_per_minute=0, tokens_per_minute=0)
+    
+    results = await asyncio.gather(*[client.aexplain_error({"message": f"boom {i}"}) for i in range(3)])
+    
+    assert all(r["summary"].startswith("answer") for r in results)
+
+
+def test_exit_hook_saves_responses_of_dropped_clients(tmp_path):
+    path = tmp_path / "responses.json"
+    
+    def run_command():
+        client = GeminiClient(api_key="test", cache_path=path)
+        client._generate(_FakeModel("flash"), "why?")
+    
+    run_command()  # Client goes out of scope without save_cache()
+    gc.collect()
+    gemini_client._save_response_caches()
+    
+    assert path.exists()
+    assert list(json.loads(path.read_text()).values()) == ["flash: why?"]
+
+
+class _StreamingModel:
+    def __init__(self):
+        self.calls = 0
+    
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        return [SimpleNamespace(text="It "), SimpleNamespace(text="broke.")]
+
+
+def test_streamed_explanations_are_cached(tmp_path, monkeypatch):
+    path = tmp_path / "explanations.json"
+    model = _StreamingModel()
+    client = GeminiClient(api_key="test", cache_path=path)
+    monkeypatch.setattr(client, "_get_model", lambda: model)
+    
+    assert "".join(client.explain_text_stream("boom")) == "It broke."
+    client.save_cache()
+    
+    reloaded = GeminiClient(api_key="test", cache_path=path)
+    monkeypatch.setattr(reloaded, "_get_model", lambda: model)
+    assert "".join(reloaded.explain_text_stream("boom")) == "It broke."
+    assert model.calls == 1
@@ -0,0 +1,66 @@
+"""
+Tests for the parsed config cache in Settings
+"""
+
+import os
+import pickle
+
+import pytest
+
+from debugai.config import settings
+from debugai.config.settings import Settings
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "home-cache"
+    monkeypatch.setattr(settings, "CONFIG_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
+def _load(path):
+    # _load_yaml only reads the given file, so skip the cwd/home lookup in __init__
+    return Settings.__new__(Settings)._load_yaml(path)
+
+
+def test_cache_tracks_content_not_mtime(tmp_path, cache_dir):
+    config = tmp_path / "config.yaml"
+    config.write_text("ai:\n  model: aaaa\n")
+    assert _load(config) == {"ai": {"model": "aaaa"}}
+    assert len(list(cache_dir.glob("*.json"))) == 1
+    stat = config.stat()
+    
+    # Same size and mtime, different content
+    config.write_text("ai:\n  model: bbbb\n")
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert _load(config) == {"ai": {"model": "bbbb"}}
+
+
+def test_cache_stays_out_of_the_project(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("ai:\n  model: aaaa\n")
+    _load(config)
+    
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["config.yaml", "home-cache"]
+
+
+def test_config_with_api_key_is_not_cached(tmp_path, cache_dir):
+    config = tmp_path / "config.yaml"
+    config.write_text("ai:\n  api_key: sk-secret\n")
+    
+    assert _load(config) == {"ai": {"api_key": "sk-secret"}}
+    assert not cache_dir.exists() or not any(cache_dir.iterdir())
+
+
+def test_pickle_cache_is_never_loaded(tmp_path):
+    config = tmp_path / "config.yaml"
+    config.write_text("ai:\n  model: aaaa\n")
+    
+    class Exploit:
+        def __reduce__(self):
+            return (os.system, ("touch " + str(tmp_path / "pwned"),))
+    
+    (tmp_path / "config.cache.pkl").write_bytes(pickle.dumps(Exploit()))
+    
+    assert _load(config) == {"ai": {"model": "aaaa"}}
+    assert not (tmp_path / "pwned").exists()
@@ -0,0 +1,70 @@
+"""
+Tests for streaming ingestion batch sizes
+"""
+
+import io
+import sys
+import threading
+import time
+
+import pytest
+
+from debugai.ingestion import stream_ingester
+from debugai.ingestion.stream_ingester import StreamIngester
+
+GIB = 1024 ** 3
+
+
+def _batch_sizes(monkeypatch, lines, buffer_size):
+    monkeypatch.setattr(sys, "stdin", io.StringIO("".join(f"line {i}\n" for i in range(lines))))
+    return [len(batch) for batch in StreamIngester().stream("stdin", buffer_size=buffer_size)]
+
+
+@pytest.mark.parametrize("buffer_size", [1, 10, 100])
+def test_batches_never_exceed_buffer_size(monkeypatch, buffer_size):
+    monkeypatch.setattr(stream_ingester, "_memory_stats", lambda: (60 * GIB, 64 * GIB))
+    
+    sizes = _batch_sizes(monkeypatch, 250, buffer_size)
+    
+    assert sum(sizes) == 250
+    assert max(sizes) == buffer_size
+    assert all(size == buffer_size for size in sizes[:-1])
+
+
+def test_batches_shrink_under_memory_pressure(monkeypatch):
+    monkeypatch.setattr(stream_ingester, "_memory_stats", lambda: (3 * GIB, 64 * GIB))
+    
+    assert _batch_sizes(monkeypatch, 100, 100) == [25, 25, 25, 25]
+
+
+def test_watch_cleans_up_when_the_consumer_stops(monkeypatch, tmp_path):
+    pytest.importorskip("watchdog")
+    from debugai.storage import database
+    
+    class FakeDatabase:
+        def get_log_sources(self):
+            return [{"name": "app", "path": str(tmp_path)}]
+    
+    monkeypatch.setattr(database, "Database", FakeDatabase)
+    log = tmp_path / "app.log"
+    log.write_text("")
+    threads_before = set(threading.enumerate())
+    
+    watcher = StreamIngester().watch()
+    entries = []
+    
+    def append_later():
+        time.sleep(0.3)
+        with open(log, "a") as f:
+            f.write("ERROR disk full\n")
+    
+    writer = threading.Thread(target=append_later)
+    writer.start()
+    for entry in watcher:
+        entries.append(entry)
+        break  # GeneratorExit at the yield once the generator is closed
+    watcher.close()
+    writer.join()
+    
+    assert entries[0]["message"] == "ERROR disk full"
+    assert set(threading.enumerate()) <= threads_before
@@ -0,0 +1,80 @@
+"""
+Tests for the per-template AI analysis cache
+"""
+
+import json
+
+from debugai.ai import template_cache
+from debugai.ai.template_cache import TemplateCache
+
+TIMEOUT = {"message": "Connection to 10.0.0.5:5432 timed out after 30s"}
+REFUSED = {"message": "Connection refused by 'db-primary'"}
+OOM = {"message": "Worker 17 killed: out of memory"}
+
+TIMEOUT_ANALYSIS = {
+    "root_causes": [{"title": "Database overloaded"}],
+    "suggestions": [{"title": "Add a connection pool"}],
+    "summary": "The database is slow.",
+}
+OOM_ANALYSIS = {
+    "root_causes": [{"title": "Memory leak in worker"}],
+    "suggestions": [{"title": "Cap worker memory"}],
+    "summary": "Workers run out of memory.",
+}
+
+
+def test_same_templates_hit_across_runs(tmp_path):
+    cache = TemplateCache(tmp_path / "ai_cache.json")
+    assert cache.get([TIMEOUT, REFUSED]) is None
+    cache.put([TIMEOUT, REFUSED], TIMEOUT_ANALYSIS)
+    cache.save()
+    
+    # Same templates with other values, in another order
+    reloaded = TemplateCache(tmp_path / "ai_cache.json")
+    later = {"message": "Connection to 10.0.0.9:5432 timed out after 12s"}
+    assert reloaded.get([REFUSED, later, REFUSED]) == TIMEOUT_ANALYSIS
+
+
+def test_other_template_sets_miss(tmp_path):
+    cache = TemplateCache(tmp_path / "ai_cache.json")
+    cache.put([TIMEOUT, REFUSED], TIMEOUT_ANALYSIS)
+    
+    # A subset or a superset is a different batch, not a partial hit
+    assert cache.get([TIMEOUT]) is None
+    assert cache.get([TIMEOUT, REFUSED, OOM]) is None
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(template_cache.time, "time", lambda: now[0])
+    cache = TemplateCache(tmp_path / "ai_cache.json", ttl_hours=1)
+    cache.put([OOM], OOM_ANALYSIS)
+    
+    now[0] += 1800
+    assert cache.get([OOM]) == OOM_ANALYSIS
+    now[0] += 3600
+    assert cache.get([OOM]) is None
+
+
+def test_eviction_keeps_the_new_entry(tmp_path):
+    cache = TemplateCache(tmp_path / "ai_cache.json", max_entries=2)
+    cache.put([TIMEOUT], TIMEOUT_ANALYSIS)
+    cache.put([REFUSED], TIMEOUT_ANALYSIS)
+    cache.get([TIMEOUT])  # Reused once, so REFUSED is evicted first
+    cache.put([OOM], OOM_ANALYSIS)
+    
+    assert cache.get([TIMEOUT]) == TIMEOUT_ANALYSIS
+    assert cache.get([REFUSED]) is None
+    assert cache.get([OOM]) == OOM_ANALYSIS
+
+
+def test_save_replaces_the_file(tmp_path):
+    path = tmp_path / "ai_cache.json"
+    path.write_text("not json")
+    cache = TemplateCache(path)
+    cache.put([OOM], OOM_ANALYSIS)
+    cache.save()
+    
+    assert [p.name for p in tmp_path.iterdir()] == ["ai_cache.json"]
+    entries = json.loads(path.read_text())["entries"]
+    assert [e["analysis"] for e in entries.values()] == [OOM_ANALYSIS]